@@ -5,6 +5,7 @@ Handles file selection, path management, and user input utilities.
 """
 import os
 import time
+from functools import lru_cache
 from pathlib import Path
 from rich.console import Console
 from rich.prompt import Prompt, Confirm, IntPrompt
@@ -14,6 +15,51 @@ console = Console()
 
 from src.shared.config import get_config
 
+VIDEO_EXTENSIONS = frozenset({'.mp4', '.mov', '.avi', '.mkv', '.webm'})
+AUDIO_EXTENSIONS = frozenset({'.mp3', '.wav', '.m4a', '.aac', '.ogg', '.flac'})
+
+
+@lru_cache(maxsize=None)
+def num_choices(n):
+    """'1'..'n' as strings, the choices for a numbered IntPrompt list"""
+    return tuple(str(i + 1) for i in range(n))
+
+
+def _list_files(directory, extensions, newest_first=False):
+    """
+    Names of the files in directory with one of the given extensions, in one
+    scandir pass; mtimes for sorting come from the same DirEntry objects.
+    """
+    with os.scandir(directory) as entries:
+        # Only the suffix is sliced off and lowercased, not the whole name
+        files = [
+            entry for entry in entries
+            if entry.name[entry.name.rfind('.'):].lower() in extensions and entry.is_file()
+        ]
+    if newest_first:
+        files.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    return [entry.name for entry in files]
+
+
+def _choose_listed_file(directory, files, heading, prompt):
+    """Print files as a numbered list under heading and return the chosen one's path"""
+    console.print(f"\n{heading}")
+    for idx, f in enumerate(files):
+        console.print(f"[bold cyan]{idx+1}.[/] {f}")
+    choice = IntPrompt.ask(prompt, choices=list(num_choices(len(files))))
+    return str(directory / files[choice-1])
+
+
+def _pick_file(directory, extensions, folder, empty_hint, heading, prompt):
+    """List the matching files in directory and let the user pick one; None if it is empty"""
+    files = _list_files(directory, extensions)
+    if not files:
+        console.print(f"[bold red]❌ La carpeta '{folder}' está vacía.[/]")
+        console.print(f"[yellow]👉 Por favor, coloca {empty_hint} en: {directory}[/]")
+        return None
+    return _choose_listed_file(directory, files, heading, prompt)
+
+
 def select_video_file(prompt="Selecciona Video de Entrada"):
     """
     Allows selecting a video from 'input' or 'output' folder with list selection.
@@ -31,10 +77,7 @@ def select_video_file(prompt="Selecciona Video de Entrada"):
         input_dir = config.input_dir
         # No need to makedirs here as config does it, but safe to keep or rely on config validation
         
-        valid_exts = ('.mp4', '.mov', '.avi', '.mkv', '.webm')
-        # os.listdir works with Path objects in recent Python, but explicit str cast is safer for older versions if needed
-        # However, config paths are Path objects.
-        files = [f for f in os.listdir(input_dir) if f.lower().endswith(valid_exts)]
+        files = _list_files(input_dir, VIDEO_EXTENSIONS)
         
         if not files:
             console.print(f"[bold red]❌ La carpeta 'input' está vacía.[/]")
@@ -50,77 +93,43 @@ def select_video_file(prompt="Selecciona Video de Entrada"):
             else:
                 return None
         else:
-            console.print(f"\n[bold green]📹 Videos disponibles en Input:[/]")
-            for idx, f in enumerate(files):
-                console.print(f"[bold cyan]{idx+1}.[/] {f}")
-            choice = IntPrompt.ask("Elige el número", choices=[str(i+1) for i in range(len(files))])
-            return str(input_dir / files[choice-1])
+            return _choose_listed_file(
+                input_dir, files, "[bold green]📹 Videos disponibles en Input:[/]", "Elige el número"
+            )
 
     else:
         # Output Dir Logic
         output_dir = config.output_dir
-        valid_exts = ('.mp4', '.mov', '.avi', '.mkv', '.webm')
-        files = [f for f in os.listdir(output_dir) if f.lower().endswith(valid_exts)]
+        # Sorted by modification time (newest first)
+        files = _list_files(output_dir, VIDEO_EXTENSIONS, newest_first=True)
         
         if not files:
             console.print(f"[bold red]❌ La carpeta 'output' está vacía.[/]")
             return None
             
-        console.print(f"\n[bold yellow]📹 Videos en Output:[/]")
-        # Sort by modification time (newest first)
-        files.sort(key=lambda x: os.path.getmtime(output_dir / x), reverse=True)
-        
-        for idx, f in enumerate(files):
-            console.print(f"[bold cyan]{idx+1}.[/] {f}")
-            
-        choice = IntPrompt.ask("Elige el video para procesar", choices=[str(i+1) for i in range(len(files))])
-        return str(output_dir / files[choice-1])
+        return _choose_listed_file(
+            output_dir, files, "[bold yellow]📹 Videos en Output:[/]", "Elige el video para procesar"
+        )
 
 
 def select_media_file():
     """
     Selects a background video from 'media' directory with list selection.
     """
-    config = get_config()
-    media_dir = config.media_dir
-    
-    valid_exts = ('.mp4', '.mov', '.avi', '.mkv', '.webm')
-    files = [f for f in os.listdir(media_dir) if f.lower().endswith(valid_exts)]
-    
-    if not files:
-        console.print(f"[bold red]❌ La carpeta 'media' está vacía.[/]")
-        console.print(f"[yellow]👉 Por favor, coloca videos de fondo (gameplay) en: {media_dir}[/]")
-        return None
-        
-    console.print(f"\n[bold magenta]🎮 Videos de Fondo Disponibles:[/]")
-    for idx, f in enumerate(files):
-        console.print(f"[bold cyan]{idx+1}.[/] {f}")
-        
-    choice = IntPrompt.ask("Elige el video de fondo", choices=[str(i+1) for i in range(len(files))])
-    return str(media_dir / files[choice-1])
+    return _pick_file(
+        get_config().media_dir, VIDEO_EXTENSIONS, 'media', "videos de fondo (gameplay)",
+        "[bold magenta]🎮 Videos de Fondo Disponibles:[/]", "Elige el video de fondo"
+    )
 
 
 def select_music_file():
     """
     Selects a music file from 'music' directory with list selection.
     """
-    config = get_config()
-    music_dir = config.music_dir
-    
-    valid_exts = ('.mp3', '.wav', '.m4a', '.aac', '.ogg', '.flac')
-    files = [f for f in os.listdir(music_dir) if f.lower().endswith(valid_exts)]
-    
-    if not files:
-        console.print(f"[bold red]❌ La carpeta 'music' está vacía.[/]")
-        console.print(f"[yellow]👉 Por favor, coloca archivos de música en: {music_dir}[/]")
-        return None
-        
-    console.print(f"\n[bold cyan]🎵 Música Disponible:[/]")
-    for idx, f in enumerate(files):
-        console.print(f"[bold cyan]{idx+1}.[/] {f}")
-        
-    choice = IntPrompt.ask("Elige la música de fondo", choices=[str(i+1) for i in range(len(files))])
-    return str(music_dir / files[choice-1])
+    return _pick_file(
+        get_config().music_dir, AUDIO_EXTENSIONS, 'music', "archivos de música",
+        "[bold cyan]🎵 Música Disponible:[/]", "Elige la música de fondo"
+    )
 
 
 def get_save_path(input_path, default_suffix, output_dir=None):
@@ -175,34 +184,36 @@ def get_save_path(input_path, default_suffix, output_dir=None):
         
     elif choice == '3':
         # List output files
-        valid_exts = ('.mp4', '.mov', '.avi', '.mkv', '.webm')
-        files = [f for f in os.listdir(output_dir) if f.lower().endswith(valid_exts)]
-        files.sort(key=lambda x: os.path.getmtime(output_dir / x), reverse=True)
+        files = _list_files(output_dir, VIDEO_EXTENSIONS, newest_first=True)
         
         if not files:
             console.print("[red]No hay archivos para sobrescribir. Usando automático.[/]")
         else:
             for idx, f in enumerate(files):
                 console.print(f"{idx+1}. {f}")
-            sel = IntPrompt.ask("Elige archivo a sobrescribir", choices=[str(i+1) for i in range(len(files))])
+            sel = IntPrompt.ask("Elige archivo a sobrescribir", choices=list(num_choices(len(files))))
             target_path = str(output_dir / files[sel-1])
             
     # Collision handling (Only for Overwrite modes)
+    # The temp file sits next to the target so finalize_output is a rename, never a copy
     if os.path.abspath(target_path) == os.path.abspath(input_path):
         console.print("[dim]✏️  Se sobrescribirá el archivo original al finalizar.[/]")
-        timestamp = int(time.time())
-        temp_path = str(output_dir / f"temp_{timestamp}_{os.path.basename(target_path)}")
-        return target_path, temp_path
+        return target_path, _temp_path_for(target_path)
         
     if os.path.exists(target_path):
          console.print(f"[yellow]⚠️  El archivo {os.path.basename(target_path)} será reemplazado.[/]")
-         timestamp = int(time.time())
-         temp_path = str(output_dir / f"temp_{timestamp}_{os.path.basename(target_path)}")
-         return target_path, temp_path
+         return target_path, _temp_path_for(target_path)
 
     return target_path, None
 
 
+def _temp_path_for(target_path: str) -> str:
+    """Temp output path in the same directory (and filesystem) as target_path"""
+    timestamp = int(time.time())
+    directory, name = os.path.split(target_path)
+    return os.path.join(directory, f"temp_{timestamp}_{name}")
+
+
 def _get_unique_path(path_obj: Path) -> Path:
     """
     If path exists, append _1, _2, etc. until unique.
@@ -226,12 +237,8 @@ def _get_unique_path(path_obj: Path) -> Path:
 def finalize_output(temp_path, final_path):
     """Helper to finalize overwrite"""
     if temp_path and os.path.exists(temp_path):
-        import shutil
-        # If final exists, remove
-        if os.path.exists(final_path):
-            os.remove(final_path)
-        shutil.move(temp_path, final_path)
-        return final_path
+        # Same directory as final_path: atomic rename that also replaces the old file
+        os.replace(temp_path, final_path)
     return final_path
 
 
@@ -243,8 +250,7 @@ def get_video_from_input_dir():
     config = get_config()
     input_dir = config.input_dir
     
-    valid_exts = ('.mp4', '.mov', '.avi', '.mkv', '.webm')
-    files = [f for f in os.listdir(input_dir) if f.lower().endswith(valid_exts)]
+    files = _list_files(input_dir, VIDEO_EXTENSIONS)
     
     if len(files) == 0:
         console.print(f"[bold red]❌ La carpeta 'input' está vacía.[/]")
@@ -256,12 +262,9 @@ def get_video_from_input_dir():
         return str(input_dir / files[0])
     
     # Allow selection if multiple
-    console.print(f"\n[bold green]📹 Videos disponibles en Input:[/]")
-    for idx, f in enumerate(files):
-        console.print(f"[bold cyan]{idx+1}.[/] {f}")
-    
-    choice = IntPrompt.ask("Elige el video a procesar", choices=[str(i+1) for i in range(len(files))])
-    return str(input_dir / files[choice-1])
+    return _choose_listed_file(
+        input_dir, files, "[bold green]📹 Videos disponibles en Input:[/]", "Elige el video a procesar"
+    )
 
 
 def get_entry_effect_choice():
@@ -278,5 +281,5 @@ def get_entry_effect_choice():
 
 
 def clear_screen():
-    """Clear the terminal screen"""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    """Clear the terminal screen (ANSI sequence through Rich, no shell spawned)"""
+    console.clear()
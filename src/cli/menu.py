@@ -3,8 +3,11 @@ Main CLI Menu Interface
 Extracted from start_worker.py for clean separation.
 Handles the Rich interactive menu and all user workflows.
 """
+import importlib
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt, Confirm, IntPrompt
@@ -19,11 +22,35 @@ from .helpers import (
     finalize_output,
     get_video_from_input_dir,
     get_entry_effect_choice,
-    clear_screen
+    clear_screen,
+    num_choices
 )
 
 console = Console()
 
+# Heavy module each menu option ends up importing. It is loaded on a background
+# thread while the user answers that option's prompts; the later regular import
+# simply waits on the module lock if it is still in progress.
+_PREFETCH_MODULES = {
+    '1': 'yt_dlp',
+    '2': 'src.workflows.pipeline',
+    '3': 'src.workflows.use_cases',
+    '6': 'src.features.audio.service',
+    '7': 'src.features.effects.speed',
+    '8': 'src.features.audio.mute',
+}
+
+
+def _prefetch_import(module_name):
+    """Start importing module_name in a daemon thread"""
+    def load():
+        try:
+            importlib.import_module(module_name)
+        except Exception:
+            pass  # The foreground import raises it again where it's handled
+    
+    threading.Thread(target=load, name=f"prefetch-{module_name}", daemon=True).start()
+
 
 def show_banner():
     """Display the application banner"""
@@ -145,6 +172,7 @@ def run_editor_ui():
         elif choice == '2':  # Blur Vert
             # 1. Ask for Title Gen
             title_text = ""
+            transcript_data = None
             use_ai_title = Confirm.ask("🧠 ¿Generar título con IA (basado en audio)?", default=True)
             
             if use_ai_title:
@@ -166,7 +194,7 @@ def run_editor_ui():
                             console.print(f"{i+1}. {t}")
                         console.print(f"{len(titles)+1}. [Escrbir Manualmente]")
                         
-                        sel = IntPrompt.ask("Elige un título", choices=[str(i+1) for i in range(len(titles)+1)], default=1)
+                        sel = IntPrompt.ask("Elige un título", choices=list(num_choices(len(titles) + 1)), default=1)
                         
                         if sel <= len(titles):
                             title_text = titles[sel-1]
@@ -194,13 +222,12 @@ def run_editor_ui():
                     from src.features.viral_clips.service import generate_video_descriptions
                     
                     # Reuse transcript if already loaded, otherwise transcribe
-                    if use_ai_title and 'transcript_data' in locals():
-                        trans_text = transcript_data['text']
-                    else:
+                    # (transcribe_video is disk-cached, so repeat visits to this menu are instant)
+                    if transcript_data is None:
                         from src.features.transcription.service import transcribe_video
                         with console.status("[bold green]🎙️  Transcribiendo para descripciones...[/]", spinner="dots"):
-                            trans_data = transcribe_video(input_path, model_size="tiny", device="cpu")
-                            trans_text = trans_data['text']
+                            transcript_data = transcribe_video(input_path, model_size="tiny", device="cpu")
+                    trans_text = transcript_data['text']
                     
                     with console.status("[bold magenta]✨ Generando descripciones...[/]", spinner="earth"):
                         descriptions = generate_video_descriptions(trans_text, title_text)
@@ -244,11 +271,30 @@ def run_editor_ui():
         Prompt.ask("\nPresiona Enter para continuar...")
 
 
+def _wait_for_pipeline(future, cancel_event):
+    """
+    Wait for the pipeline future and return its result. Ctrl-C sets cancel_event
+    and keeps waiting: the pipeline starts no new clips, and the ones already
+    running (their workers and ffmpeg processes ignore the Ctrl-C) are finished.
+    """
+    while not future.done():
+        try:
+            wait([future], timeout=0.2)
+        except KeyboardInterrupt:
+            if not cancel_event.is_set():
+                cancel_event.set()
+                console.print("\n[yellow]⚠️ Interrumpido por usuario: terminando los clips en curso...[/]")
+    return future.result()
+
+
 def run_job_ui(mode):
     """Handle the selected menu option"""
     url = None
     input_path = None
     
+    if mode in _PREFETCH_MODULES:
+        _prefetch_import(_PREFETCH_MODULES[mode])
+    
     if mode == '1':
         # Download Video (Generic)
         console.print("\n[bold cyan]Plataforma de Descarga:[/]")
@@ -487,6 +533,14 @@ def run_job_ui(mode):
     console.print("- [cyan]No[/]: Convierte todo el video a vertical (sin cortes)")
     use_gemini = Confirm.ask("🧠 ¿Usar IA para detectar virales?", default=True)
     skip_analysis = not use_gemini
+    
+    ffmpeg_threads = None
+    if use_gemini:
+        # Clips are encoded concurrently; their threads together shouldn't exceed the cores
+        from src.shared.config import get_config
+        ffmpeg_threads = max(1, IntPrompt.ask(
+            "🧵 Hilos de FFmpeg por clip", default=get_config().ffmpeg_threads_per_clip
+        ))
 
     console.print(Panel("🚀 Iniciando Pipeline...", style="bold green"))
 
@@ -499,23 +553,28 @@ def run_job_ui(mode):
         input("Enter para volver...")
         return
 
+    # The pipeline runs on a worker thread so the main thread stays free to
+    # catch Ctrl-C and ask it to stop at the next stage boundary
+    cancel_event = threading.Event()
     try:
-        run_pipeline(
-            input_path=input_path,
-            url=url,
-            output_dir="output",
-            use_subs=use_subs,
-            skip_analysis=skip_analysis,
-            alignment=align,
-            single_word=single_word
-        )
-    except KeyboardInterrupt:
-        console.print("\n[yellow]⚠️ Interrumpido por usuario[/]")
-    except Exception as e:
-        console.print(f"\n[bold red]❌ Error fatal:[/]")
-        console.print(e)
-        import traceback
-        traceback.print_exc()
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline") as executor:
+            future = executor.submit(
+                run_pipeline,
+                input_path=input_path,
+                url=url,
+                output_dir="output",
+                use_subs=use_subs,
+                skip_analysis=skip_analysis,
+                alignment=align,
+                single_word=single_word,
+                cancel_event=cancel_event,
+                ffmpeg_threads=ffmpeg_threads
+            )
+            _wait_for_pipeline(future, cancel_event)
+    except Exception:
+        console.print("\n[bold red]❌ Error fatal:[/]")
+        # One Rich render of the traceback (the message is part of it)
+        console.print_exception(show_locals=False)
         
     console.print("\n[bold green]✅ Proceso finalizado[/]")
     Prompt.ask("Presiona Enter para volver al menú...")
@@ -1,12 +1,11 @@
 import cv2
-import os
-import numpy as np
 from ultralytics import YOLO
 from src.shared.config import get_config
 
 # Lazy-loaded models
 _yolo_model = None
 _face_net = None
+_cuda_available = None
 
 def get_yolo_model():
     global _yolo_model
@@ -79,6 +78,34 @@ def detect_face_candidates(frame):
 
     return candidates
 
+def yolo_batching_available():
+    """Batched YOLO inference is only worth it on a CUDA device"""
+    global _cuda_available
+    if _cuda_available is None:
+        try:
+            import torch
+            _cuda_available = torch.cuda.is_available()
+        except ImportError:
+            _cuda_available = False
+    return _cuda_available
+
+def _best_person_box(result):
+    best_box = None
+    max_area = 0
+    
+    for box in result.boxes:
+        x1, y1, x2, y2 = [int(i) for i in box.xyxy[0]]
+        w = x2 - x1
+        h = y2 - y1
+        area = w * h
+        
+        if area > max_area:
+            max_area = area
+            face_h = int(h * 0.4)
+            best_box = [x1, y1, w, face_h]
+            
+    return best_box, max_area
+
 def detect_person_yolo(frame):
     model = get_yolo_model()
     results = model(frame, verbose=False, classes=[0]) 
@@ -90,16 +117,20 @@ def detect_person_yolo(frame):
     max_area = 0
     
     for result in results:
-        boxes = result.boxes
-        for box in boxes:
-            x1, y1, x2, y2 = [int(i) for i in box.xyxy[0]]
-            w = x2 - x1
-            h = y2 - y1
-            area = w * h
-            
-            if area > max_area:
-                max_area = area
-                face_h = int(h * 0.4)
-                best_box = [x1, y1, w, face_h]
+        box, area = _best_person_box(result)
+        if area > max_area:
+            max_area = area
+            best_box = box
                 
     return best_box
+
+def detect_person_yolo_batch(frames):
+    """
+    Runs YOLO on a list of frames in a single forward pass.
+    Returns one box (or None) per frame, in order.
+    """
+    if not frames:
+        return []
+    model = get_yolo_model()
+    results = model(frames, verbose=False, classes=[0])
+    return [_best_person_box(result)[0] for result in results]
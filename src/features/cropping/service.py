@@ -4,14 +4,80 @@ Smart video cropping with face/person tracking.
 Consolidates logic from separate cropping modules.
 """
 import cv2
+import numpy as np
 import os
-from pathlib import Path
+import queue
+import subprocess
+import threading
+import time
 from tqdm import tqdm
 
+from src.shared.exceptions import FFmpegError, VideoProcessingError
+from src.shared.ffmpeg import format_timestamp, get_h264_encoder, get_video_info, video_encoder_args
+from src.shared.ffmpeg_pool import job_thread_count
+
 from .tracking import SmoothedCameraman, SpeakerTracker
-from .detectors import detect_face_candidates, detect_person_yolo
-from .scene_strategy import create_general_frame
-from .scenes import detect_scenes, analyze_scenes_strategy
+from .detectors import (
+    detect_face_candidates,
+    detect_person_yolo,
+    detect_person_yolo_batch,
+    yolo_batching_available,
+)
+
+# Size OpenCV's parallel_for_ pool explicitly: clips already run in parallel
+# processes, so letting every worker claim all cores oversubscribes the CPU
+cv2.setNumThreads(max(1, (os.cpu_count() or 4) // 2))
+cv2.setUseOptimized(True)
+
+# Bounded hand-off between the decode, transform and encode stages
+_QUEUE_SIZE = 8
+
+# Run face/person detection on every Nth frame; the cameraman keeps panning
+# toward the last target in between
+DETECT_EVERY = 3
+
+# Detectors run on a copy downscaled to this width; boxes are scaled back up
+DETECT_WIDTH = 480
+
+# Progress bar is advanced in batches instead of once per frame
+PROGRESS_EVERY_FRAMES = 16
+PROGRESS_EVERY_SECONDS = 0.1
+
+# Images per YOLO forward pass when batching is enabled (GPU only)
+YOLO_BATCH_SIZE = 8
+
+# Marks frames that skipped detection (None already means "nothing detected")
+_NOT_SAMPLED = object()
+
+# Pipe buffer for raw frame I/O with ffmpeg (default 8KB means many tiny syscalls)
+_PIPE_BUFSIZE = 1 << 20
+
+
+def _upscale_box(box, factor):
+    """Maps an [x, y, w, h] box from the detection frame back to source pixels"""
+    return [int(v * factor) for v in box]
+
+
+def _put(q, item, stop):
+    """Blocking put that gives up once another stage has failed"""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q, stop):
+    """Blocking get that returns None (end of stream) once another stage has failed"""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return None
+
 
 class CroppingService:
     """
@@ -37,15 +103,15 @@ class CroppingService:
         """
         print(f"✂️  Smart Cropping: {os.path.basename(input_path)}")
         
-        cap = cv2.VideoCapture(input_path)
-        if not cap.isOpened():
-            raise IOError(f"Cannot open video: {input_path}")
-            
-        # Video Properties
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        # Video Properties (frames themselves are decoded by ffmpeg below)
+        try:
+            info = get_video_info(input_path)
+        except VideoProcessingError as e:
+            raise IOError(f"Cannot open video: {input_path}") from e
+        fps = info.fps
+        total_frames = info.frame_count
+        width = info.width
+        height = info.height
         
         # Calculate frame range
         start_frame = int(start_time * fps)
@@ -63,69 +129,280 @@ class CroppingService:
         # Initialize Trackers
         cameraman = SmoothedCameraman(target_width, target_height, width, height)
         speaker_tracker = SpeakerTracker(stabilization_frames=int(fps/2)) # 0.5s stabilization
+        detect_scale = min(1.0, DETECT_WIDTH / width)
         
-        # Initialize Writer
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(output_path, fourcc, fps, (target_width, target_height))
+        # Initialize Writer: raw BGR frames piped into an ffmpeg encoder
+        out = self._open_encoder(output_path, fps, target_width, target_height, input_path, start_time, end_time, info.has_audio)
         
-        # Seek to start
-        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+        # Decode only the requested range straight to raw BGR on a pipe,
+        # instead of seeking frame-by-frame through cv2
+        decoder = self._open_decoder(input_path, start_time, end_time)
+        
+        # Pipeline: reader thread -> detect/crop (this thread) -> writer thread
+        decode_q = queue.Queue(_QUEUE_SIZE)
+        encode_q = queue.Queue(_QUEUE_SIZE)
+        stop = threading.Event()
+        errors = []
+        
+        reader = threading.Thread(
+            target=self._read_frames,
+            args=(decoder, width, height, start_frame, end_frame, decode_q, stop, errors),
+            daemon=True
+        )
+        writer = threading.Thread(
+            target=self._write_frames,
+            args=(out, encode_q, stop, errors),
+            daemon=True
+        )
         
-        # Main Loop
         pbar = tqdm(total=duration_frames, desc="   Processing Frames", unit="fr")
+        reader.start()
+        writer.start()
         
-        current_frame_idx = start_frame
+        # Reusable output frames. A buffer can sit in encode_q (_QUEUE_SIZE) or be
+        # mid-write in the writer (1) while the next one is filled (1), so a ring of
+        # _QUEUE_SIZE + 2 is never overwritten before ffmpeg has consumed it.
+        output_bufs = [
+            np.empty((target_height, target_width, 3), dtype=np.uint8)
+            for _ in range(_QUEUE_SIZE + 2)
+        ]
+        buf_idx = 0
         
+        # Batched YOLO only pays off on GPU; on CPU frames are handled one at a time.
+        # Only every DETECT_EVERY-th frame is detected, so buffer enough frames to
+        # give YOLO up to YOLO_BATCH_SIZE images per forward pass.
+        batch_size = YOLO_BATCH_SIZE * DETECT_EVERY if yolo_batching_available() else 1
+        
+        failed = False
+        pending = 0
+        last_refresh = time.monotonic()
         try:
-            while current_frame_idx < end_frame:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                    
-                # 1. Detection
-                # Try faces first (more precise)
-                candidates = detect_face_candidates(frame)
-                target_box = None
+            eof = False
+            while not eof:
+                # Pull up to batch_size frames so YOLO can run them in one forward pass
+                batch = []
+                while len(batch) < batch_size:
+                    item = _get(decode_q, stop)
+                    if item is None:
+                        eof = True
+                        break
+                    batch.append(item)
                 
-                if candidates:
-                     target_box = speaker_tracker.get_target(candidates, current_frame_idx, width)
+                # 1. Detection (sampled; dominant CPU cost per frame)
+                targets = self._detect_targets(
+                    batch, start_frame, detect_scale, width, speaker_tracker, batch_size > 1
+                )
                 
-                # Fallback to YOLO person detection if no faces found
-                if not target_box:
-                    target_box = detect_person_yolo(frame)
+                for (current_frame_idx, frame), target_box in zip(batch, targets):
+                    # 2. Update Cameraman
+                    if target_box is not _NOT_SAMPLED:
+                        cameraman.update_target(target_box)
                     
-                # 2. Update Cameraman
-                cameraman.update_target(target_box)
-                
-                # 3. Get Crop Coordinates
-                x1, y1, x2, y2 = cameraman.get_crop_box()
-                
-                # 4. Crop & Resize
-                crop = frame[y1:y2, x1:x2]
-                
-                if crop.size == 0:
-                    # Safety fallback
-                    resized_crop = cv2.resize(frame, (target_width, target_height))
-                else:
-                    resized_crop = cv2.resize(crop, (target_width, target_height))
-                
-                # Write
-                out.write(resized_crop)
-                
-                current_frame_idx += 1
-                pbar.update(1)
+                    # 3. Get Crop Coordinates
+                    x1, y1, x2, y2 = cameraman.get_crop_box()
+                    
+                    # 4. Crop & Resize
+                    crop = frame[y1:y2, x1:x2]
+                    
+                    # The cameraman guarantees a non-empty box, so no per-frame size check
+                    output_buf = output_bufs[buf_idx]
+                    buf_idx = (buf_idx + 1) % len(output_bufs)
+                    resized_crop = cv2.resize(crop, (target_width, target_height), dst=output_buf)
+                    
+                    # Hand off to the writer
+                    if not _put(encode_q, resized_crop, stop):
+                        eof = True
+                        break
+                    
+                    pending += 1
+                    if pending >= PROGRESS_EVERY_FRAMES or time.monotonic() - last_refresh >= PROGRESS_EVERY_SECONDS:
+                        pbar.update(pending)
+                        pending = 0
+                        last_refresh = time.monotonic()
                 
         except Exception as e:
             print(f"❌ Error during cropping: {e}")
+            failed = True
+            stop.set()
             raise
         finally:
+            # End of stream for the writer, then drain both stages
+            _put(encode_q, None, stop)
+            writer.join()
+            stop.set()
+            reader.join()
+            if pending:
+                pbar.update(pending)
             pbar.close()
-            cap.release()
-            out.release()
+            if decoder.poll() is None:
+                decoder.kill()
+            decoder.stdout.close()
+            decoder.wait()
+            if (failed or errors) and out.poll() is None:
+                out.kill()
+            try:
+                out.stdin.close()
+            except BrokenPipeError:
+                pass
+            out.wait()
+        
+        if not errors and out.returncode != 0:
+            errors.append(FFmpegError(
+                f"Failed to encode cropped video (exit code {out.returncode})",
+                command=' '.join(out.args)
+            ))
+        
+        if errors:
+            print(f"❌ Error during cropping: {errors[0]}")
+            raise errors[0]
             
         print(f"✅ Cropped video saved to: {output_path}")
         return True
 
+    def _detect_targets(self, batch, start_frame, detect_scale, width, speaker_tracker, batched_yolo):
+        """
+        Runs detection on the sampled frames of a batch. Returns one entry per frame:
+        the target box (or None if nothing was found) for sampled frames, and
+        _NOT_SAMPLED for frames that skip detection.
+        """
+        targets = [_NOT_SAMPLED] * len(batch)
+        needs_yolo = []  # (batch position, downscaled frame)
+        
+        for pos, (current_frame_idx, frame) in enumerate(batch):
+            if (current_frame_idx - start_frame) % DETECT_EVERY != 0:
+                continue
+            
+            if detect_scale < 1.0:
+                small = cv2.resize(frame, None, fx=detect_scale, fy=detect_scale, interpolation=cv2.INTER_AREA)
+            else:
+                small = frame
+            
+            # Try faces first (more precise)
+            candidates = detect_face_candidates(small)
+            if detect_scale < 1.0:
+                candidates = [
+                    {'box': box, 'score': box[2] * box[3]}
+                    for box in (_upscale_box(c['box'], 1.0 / detect_scale) for c in candidates)
+                ]
+            target_box = None
+            
+            if candidates:
+                 target_box = speaker_tracker.get_target(candidates, current_frame_idx, width)
+            
+            targets[pos] = target_box
+            if not target_box:
+                needs_yolo.append((pos, small))
+        
+        # Fallback to YOLO person detection if no faces found
+        if needs_yolo:
+            if batched_yolo:
+                boxes = detect_person_yolo_batch([small for _, small in needs_yolo])
+            else:
+                boxes = [detect_person_yolo(small) for _, small in needs_yolo]
+            
+            for (pos, _), box in zip(needs_yolo, boxes):
+                if box and detect_scale < 1.0:
+                    box = _upscale_box(box, 1.0 / detect_scale)
+                targets[pos] = box
+        
+        return targets
+    
+    def _open_decoder(self, input_path, start_time, end_time):
+        """Start an ffmpeg process that writes the clip range as raw BGR frames to stdout"""
+        command = [
+            'ffmpeg', '-nostdin', '-loglevel', 'error',
+            '-ss', format_timestamp(start_time),
+        ]
+        if end_time:
+            command += ['-to', format_timestamp(end_time)]
+        command += [
+            # Autorotated, so frames come out upright at the probe's display geometry
+            '-i', input_path,
+            '-an', '-sn',
+            '-f', 'rawvideo', '-pix_fmt', 'bgr24',
+            '-'
+        ]
+        return subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=_PIPE_BUFSIZE,
+            start_new_session=True  # Out of reach of the terminal's Ctrl-C
+        )
+    
+    def _open_encoder(self, output_path, fps, width, height, input_path, start_time, end_time, has_audio=True):
+        """
+        Start an ffmpeg process that encodes raw BGR frames read from stdin and
+        muxes in the matching audio range of the source in the same pass.
+        Sources without an audio track skip the second input entirely.
+        """
+        audio_input = []
+        audio_args = []
+        if has_audio:
+            audio_input = ['-ss', format_timestamp(start_time)]
+            if end_time:
+                audio_input += ['-to', format_timestamp(end_time)]
+            audio_input += ['-i', input_path]
+            audio_args = ['-map', '1:a?', '-c:a', 'aac', '-shortest']
+        
+        command = [
+            'ffmpeg', '-y', '-nostdin', '-loglevel', 'error',
+            '-f', 'rawvideo', '-vcodec', 'rawvideo', '-pix_fmt', 'bgr24',
+            '-s', f'{width}x{height}',
+            '-r', str(fps),
+            '-thread_queue_size', '512',
+            '-i', '-',
+            *audio_input,
+            '-map', '0:v',
+            # Favor steady throughput so the Python side never stalls on stdin
+            *video_encoder_args(get_h264_encoder(), x264_preset='ultrafast', x264_tune='zerolatency'),
+            '-threads', str(job_thread_count(os.cpu_count() or 0)),
+            *audio_args,
+            output_path
+        ]
+        return subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=_PIPE_BUFSIZE,
+            start_new_session=True
+        )
+    
+    def _read_frames(self, decoder, width, height, start_frame, end_frame, decode_q, stop, errors):
+        """Decode stage: pushes (frame_index, frame) tuples, then None at EOF"""
+        frame_size = width * height * 3
+        try:
+            current_frame_idx = start_frame
+            while current_frame_idx < end_frame and not stop.is_set():
+                data = decoder.stdout.read(frame_size)
+                if len(data) < frame_size:
+                    break
+                frame = np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3)
+                if not _put(decode_q, (current_frame_idx, frame), stop):
+                    return
+                current_frame_idx += 1
+            
+            if current_frame_idx == start_frame and decoder.wait() != 0:
+                raise IOError(f"ffmpeg could not decode video (exit code {decoder.returncode})")
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            _put(decode_q, None, stop)
+    
+    def _write_frames(self, out, encode_q, stop, errors):
+        """Encode stage: writes frames until it receives None"""
+        try:
+            while True:
+                frame = _get(encode_q, stop)
+                if frame is None:
+                    return
+                # cv2.resize output is C-contiguous: hand the buffer over without a tobytes() copy
+                out.stdin.write(memoryview(frame))
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+
 # Backward compatibility (since pipeline calls this function directly)
 def process_viral_clip_with_smart_crop(input_path, start, end, output_path):
     """
@@ -1,5 +1,47 @@
-import numpy as np
 from src.shared.config import get_config
+from src.shared.exceptions import VideoCorruptedError
+from src.shared.jit import njit
+
+
+@njit(cache=True)
+def _compute_crop_box(current_x, target_x, safe_zone_radius, crop_width, video_width, video_height, force_snap):
+    """
+    Pure per-frame cameraman math: advances the center toward the target and
+    returns (new_center_x, x1, y1, x2, y2). JIT-compiled when numba is available.
+    """
+    if force_snap:
+        current_x = target_x
+    else:
+        diff = target_x - current_x
+        
+        if abs(diff) > safe_zone_radius:
+            direction = 1.0 if diff > 0 else -1.0
+            
+            if abs(diff) > crop_width * 0.5:
+                speed = 15.0 # Fast re-frame
+            else:
+                speed = 3.0  # Slow, steady pan
+            
+            current_x += direction * speed
+            
+            new_diff = target_x - current_x
+            if (direction > 0 and new_diff < 0) or (direction < 0 and new_diff > 0):
+                current_x = target_x
+        
+    # Clamp center
+    half_crop = crop_width / 2
+    
+    if current_x - half_crop < 0:
+        current_x = half_crop
+    if current_x + half_crop > video_width:
+        current_x = video_width - half_crop
+        
+    # Always a non-empty box inside the frame, so callers can slice without checking
+    x1 = min(max(0, int(current_x - half_crop)), int(video_width) - 1)
+    x2 = max(min(int(video_width), int(current_x + half_crop)), x1 + 1)
+    
+    return current_x, x1, 0, x2, int(video_height)
+
 
 class SmoothedCameraman:
     """
@@ -29,6 +71,11 @@ class SmoothedCameraman:
              self.crop_width = video_width
              self.crop_height = int(self.crop_width / self.aspect_ratio)
              
+        # Checked explicitly (not asserted) so it holds under python -O too:
+        # _compute_crop_box relies on it for its non-empty box guarantee
+        if min(video_width, video_height, self.crop_width, self.crop_height) <= 0:
+            raise VideoCorruptedError(f"Invalid crop geometry for {video_width}x{video_height} video")
+             
         # Safe Zone: 20% of the video width
         self.safe_zone_radius = self.crop_width * 0.25
 
@@ -44,42 +91,15 @@ class SmoothedCameraman:
         """
         Returns the (x1, y1, x2, y2) for the current frame.
         """
-        if force_snap:
-            self.current_center_x = self.target_center_x
-        else:
-            diff = self.target_center_x - self.current_center_x
-            
-            if abs(diff) > self.safe_zone_radius:
-                direction = 1 if diff > 0 else -1
-                
-                if abs(diff) > self.crop_width * 0.5:
-                    speed = 15.0 # Fast re-frame
-                else:
-                    speed = 3.0  # Slow, steady pan
-                
-                self.current_center_x += direction * speed
-                
-                new_diff = self.target_center_x - self.current_center_x
-                if (direction == 1 and new_diff < 0) or (direction == -1 and new_diff > 0):
-                    self.current_center_x = self.target_center_x
-            
-        # Clamp center
-        half_crop = self.crop_width / 2
-        
-        if self.current_center_x - half_crop < 0:
-            self.current_center_x = half_crop
-        if self.current_center_x + half_crop > self.video_width:
-            self.current_center_x = self.video_width - half_crop
-            
-        x1 = int(self.current_center_x - half_crop)
-        x2 = int(self.current_center_x + half_crop)
-        
-        x1 = max(0, x1)
-        x2 = min(self.video_width, x2)
-        
-        y1 = 0
-        y2 = self.video_height
-        
+        self.current_center_x, x1, y1, x2, y2 = _compute_crop_box(
+            float(self.current_center_x),
+            float(self.target_center_x),
+            float(self.safe_zone_radius),
+            float(self.crop_width),
+            float(self.video_width),
+            float(self.video_height),
+            force_snap
+        )
         return x1, y1, x2, y2
 
 class SpeakerTracker:
@@ -1,5 +1,73 @@
-import subprocess
-import os
+from contextlib import nullcontext
+from pathlib import Path
+
+import numpy as np
+
+from src.shared.ffmpeg import build_subtitle_style, get_h264_encoder, hw_decode_args, video_encoder_args
+from src.shared.ffmpeg_pool import job_thread_count, run_ffmpeg
+from src.shared.jit import NUMBA_AVAILABLE, njit
+
+SRT_WRITE_BUFFER = 64 * 1024
+
+# One numbered SRT cue (same layout as models.format_srt_block), filled from _srt_time_fields rows
+_SRT_BLOCK = "%d\n%02d:%02d:%02d,%03d --> %02d:%02d:%02d,%03d\n%s\n\n"
+
+def _flatten_words(transcript):
+    """Returns (words, starts, ends, lengths) for all words of the transcript, in order."""
+    words = [w for segment in transcript.get('segments', []) for w in segment.get('words', [])]
+    starts = np.fromiter((w['start'] for w in words), dtype=np.float64, count=len(words))
+    ends = np.fromiter((w['end'] for w in words), dtype=np.float64, count=len(words))
+    lengths = np.fromiter((len(w['word']) for w in words), dtype=np.int64, count=len(words))
+    return words, starts, ends, lengths
+
+
+def _group_words(starts, ends, lengths, max_chars, max_duration):
+    """
+    Greedy phrase grouping: returns the index of the first word of each block.
+    A block is closed when the next word would push it past max_chars (each word
+    counting one extra char for its separator) or its span past max_duration.
+    """
+    if NUMBA_AVAILABLE:
+        return _group_words_kernel(starts, ends, lengths, max_chars, max_duration)
+    # Each block depends on the last, so there is nothing to vectorize; as plain
+    # Python the loop runs several times faster over lists than over numpy scalars
+    return _group_words_kernel(starts.tolist(), ends.tolist(), lengths.tolist(), max_chars, max_duration)
+
+
+@njit(cache=True)
+def _group_words_kernel(starts, ends, lengths, max_chars, max_duration):
+    """The _group_words loop; takes arrays when compiled, lists when not"""
+    n = len(starts)
+    breaks = np.empty(n, np.int64)
+    if n == 0:
+        return breaks
+    
+    breaks[0] = 0
+    count = 1
+    block_start = starts[0]
+    text_len = lengths[0] + 1
+    for i in range(1, n):
+        if text_len + lengths[i] > max_chars or ends[i] - block_start > max_duration:
+            breaks[count] = i
+            count += 1
+            block_start = starts[i]
+            text_len = lengths[i] + 1
+        else:
+            text_len += lengths[i] + 1
+    return breaks[:count]
+
+
+def _srt_time_fields(seconds):
+    """
+    Split non-negative seconds into (hours, minutes, seconds, milliseconds) rows,
+    rounded to the millisecond exactly like models.format_srt_time.
+    """
+    ms = (seconds * 1000 + 0.5).astype(np.int64)
+    hours, ms = np.divmod(ms, 3_600_000)
+    minutes, ms = np.divmod(ms, 60_000)
+    secs, ms = np.divmod(ms, 1000)
+    return np.stack((hours, minutes, secs, ms), axis=1)
+
 
 class SubtitleRenderer:
     """
@@ -10,105 +78,60 @@ class SubtitleRenderer:
         """
         Generates SRT file from transcript within the time range[clip_start, clip_end].
         Args:
+            output_path: SRT file path, or a writable text stream (e.g. io.StringIO) for in-memory use.
             single_word: If True, each word is a separate subtitle block (dynamic style).
         """
-        words = []
         # 1. Extract and flatten words within range
-        for segment in transcript.get('segments', []):
-            for word_info in segment.get('words', []):
-                if word_info['end'] > clip_start and word_info['start'] < clip_end:
-                    words.append(word_info)
-        
-        if not words:
-            # Create an empty file to avoid errors downstream if no speech
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write("")
-            return False
-
-        srt_content = ""
-        index = 1
+        all_words, all_starts, all_ends, all_lengths = _flatten_words(transcript)
+        selected = np.flatnonzero((all_ends > clip_start) & (all_starts < clip_end))
+        words = [all_words[i] for i in selected]
         
-        # SINGLE WORD MODE (Dynamic)
-        if single_word:
-            for word in words:
-                start = max(0, word['start'] - clip_start)
-                end = max(0, word['end'] - clip_start)
-                
-                # Minimum duration for readability? 
-                # Ideally word-level is fast, but 0.1s might be too fast?
-                # Let's stick to exact timestamps for "dynamic" feel.
-                
-                text = word['word'].strip()
-                srt_content += self._format_srt_block(index, start, end, text)
-                index += 1
-                
-        # STANDARD PHRASE MODE
+        # Blocks are written as they are formatted; a large buffer keeps that to a few syscalls
+        if hasattr(output_path, 'write'):
+            out = nullcontext(output_path)
         else:
-            current_block = []
-            block_start = None
+            out = open(output_path, 'w', encoding='utf-8', newline='', buffering=SRT_WRITE_BUFFER)
+        
+        with out as f:
+            if not words:
+                # Create an empty file to avoid errors downstream if no speech
+                return False
             
-            for i, word in enumerate(words):
-                start = max(0, word['start'] - clip_start)
-                end = max(0, word['end'] - clip_start)
-                
-                if not current_block:
-                    current_block.append(word)
-                    block_start = start
-                else:
-                    current_text_len = sum(len(w['word']) + 1 for w in current_block)
-                    duration = end - block_start
-                    
-                    if current_text_len + len(word['word']) > max_chars or duration > max_duration:
-                        block_end = current_block[-1]['end'] - clip_start
-                        
-                        text = " ".join([w['word'] for w in current_block]).strip()
-                        srt_content += self._format_srt_block(index, block_start, block_end, text)
-                        index += 1
-                        
-                        current_block = [word]
-                        block_start = start
-                    else:
-                        current_block.append(word)
+            starts = np.maximum(all_starts[selected] - clip_start, 0)
+            ends = np.maximum(all_ends[selected] - clip_start, 0)
             
-            if current_block:
-                block_end = current_block[-1]['end'] - clip_start
-                text = " ".join([w['word'] for w in current_block]).strip()
-                srt_content += self._format_srt_block(index, block_start, block_end, text)
+            # SINGLE WORD MODE (Dynamic): exact word timestamps for the "dynamic" feel
+            if single_word:
+                texts = [word['word'].strip() for word in words]
+                
+            # STANDARD PHRASE MODE
+            else:
+                breaks = _group_words(starts, ends, all_lengths[selected], max_chars, max_duration)
+                lasts = np.append(breaks[1:], len(words)) - 1
+                bounds = zip(breaks.tolist(), lasts.tolist())
+                texts = [" ".join([w['word'] for w in words[first:last + 1]]).strip() for first, last in bounds]
+                starts = starts[breaks]
+                ends = all_ends[selected][lasts] - clip_start
             
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(srt_content)
+            # Timestamps are split into h/m/s/ms in a few array ops; Python only joins text
+            write = f.write
+            times = np.hstack((_srt_time_fields(starts), _srt_time_fields(ends))).tolist()
+            for index, (fields, text) in enumerate(zip(times, texts), 1):
+                write(_SRT_BLOCK % (index, *fields, text))
             
         return True
 
-    def _format_srt_block(self, index, start, end, text):
-        def format_time(seconds):
-            hours = int(seconds // 3600)
-            minutes = int((seconds % 3600) // 60)
-            secs = int(seconds % 60)
-            millis = int((seconds - int(seconds)) * 1000)
-            return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
-            
-        return f"{index}\n{format_time(start)} --> {format_time(end)}\n{text}\n\n"
-
-    def burn_subtitles_to_video(self, video_path, srt_path, output_path, alignment="bottom", fontsize=16):
+    def burn_subtitles_to_video(self, video_path, srt_path, output_path, alignment="bottom", fontsize=16, threads=None):
         """
         Burns subtitles into the video using FFmpeg.
+        threads: FFmpeg -threads override; defaults to this process's per-job cap (or auto).
         """
-        final_fontsize = int(fontsize * 0.5) 
-        if final_fontsize < 8: final_fontsize = 8
-
-        ass_alignment = 2 # Default Bottom
-        if str(alignment).lower() == 'top': ass_alignment = 6
-        if str(alignment).lower() == 'middle': ass_alignment = 10
-
-        try:
-            # Cross-platform safe path for ffmpeg filter
-            safe_srt_path = str(srt_path).replace('\\', '/').replace(':', '\\:')
-        except:
-            safe_srt_path = str(srt_path)
+        video_path = Path(video_path)
+        srt_path = Path(srt_path)
+        output_path = Path(output_path)
 
         # Ensure srt path exists
-        if not os.path.exists(str(srt_path)):
+        if not srt_path.exists():
             # If no subtitles, just copy video
             cmd_copy = [
                 'ffmpeg', '-y',
@@ -116,23 +139,30 @@ class SubtitleRenderer:
                 '-c', 'copy',
                 str(output_path)
             ]
-            subprocess.run(cmd_copy, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            run_ffmpeg(cmd_copy)
             return True
 
-        style_string = f"Alignment={ass_alignment},Fontname=Verdana,Fontsize={final_fontsize},PrimaryColour=&H00FFFFFF,OutlineColour=&H60000000,BackColour=&H00000000,BorderStyle=3,Outline=1,Shadow=0,MarginV=25,Bold=1"
+        # Cross-platform safe path for ffmpeg filter
+        safe_srt_path = str(srt_path).replace('\\', '/').replace(':', '\\:')
+        style_string = build_subtitle_style(str(alignment).lower(), fontsize)
+        encoder = get_h264_encoder()
         
         cmd = [
             'ffmpeg', '-y',
+            *hw_decode_args(encoder),
             '-i', str(video_path),
             '-vf', f"subtitles='{safe_srt_path}':force_style='{style_string}'",
             '-c:a', 'copy',
-            '-c:v', 'libx264', '-preset', 'fast', '-crf', '23',
+            *video_encoder_args(encoder),
+            '-threads', str(threads if threads is not None else job_thread_count()),
+            '-max_muxing_queue_size', '9999',
+            '-movflags', '+faststart',  # moov atom up front for streaming uploads
             str(output_path)
         ]
         
-        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        returncode, stderr = run_ffmpeg(cmd)
         
-        if result.returncode != 0:
-            raise Exception(f"FFmpeg failed: {result.stderr.decode()}")
+        if returncode != 0:
+            raise Exception(f"FFmpeg failed: {stderr}")
 
         return True
@@ -3,6 +3,7 @@ Subtitles Service
 High-level subtitle operations.
 """
 from pathlib import Path
+from src.shared.ffmpeg import get_video_info
 from .renderer import SubtitleRenderer
 
 
@@ -42,7 +43,6 @@ class SubtitlesService:
             True if successful
         """
         if clip_end is None:
-            from src.shared.ffmpeg import get_video_info
             info = get_video_info(str(video_path))
             clip_end = info.duration
         
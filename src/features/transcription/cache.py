@@ -0,0 +1,73 @@
+"""
+Transcript Cache
+Disk cache for transcription results, keyed on the media content and Whisper settings.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from src.shared.config import get_config
+
+# Bytes hashed from each end of the file; enough to tell different media apart
+# without reading multi-GB sources in full
+HASH_EDGE_BYTES = 1024 * 1024
+
+
+def transcript_cache_key(video_path: str | Path, *settings) -> str:
+    """
+    Hash the first and last MiB of the file plus its size and mtime, together with
+    the settings that change the output (model, compute type, ...).
+    """
+    stat = os.stat(video_path)
+    digest = hashlib.blake2b(digest_size=20)
+    with open(video_path, 'rb') as f:
+        digest.update(f.read(HASH_EDGE_BYTES))
+        if stat.st_size > 2 * HASH_EDGE_BYTES:
+            f.seek(-HASH_EDGE_BYTES, os.SEEK_END)
+            digest.update(f.read(HASH_EDGE_BYTES))
+    digest.update(f"{stat.st_size}|{stat.st_mtime_ns}|{'|'.join(map(str, settings))}".encode())
+    return digest.hexdigest()
+
+
+def load_cached_transcript(key: str) -> Optional[dict]:
+    """Return the cached transcript dict for key, or None on a miss"""
+    path = get_config().transcript_cache_dir / f"{key}.json"
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    try:
+        os.utime(path)  # Touch so eviction sees it as recently used
+    except OSError:
+        pass  # Read-only or foreign-owned cache: the hit is still valid
+    return data
+
+
+def store_transcript(key: str, data: dict):
+    """Write a transcript atomically, then evict least recently used entries over the size cap"""
+    config = get_config()
+    cache_dir = config.transcript_cache_dir
+    path = cache_dir / f"{key}.json"
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        _evict(cache_dir, int(config.transcript_cache_max_gb * 1024 ** 3))
+    except OSError:
+        pass  # Cache is best-effort
+
+
+def _evict(cache_dir: Path, max_bytes: int):
+    entries = [(entry.stat().st_mtime, entry.stat().st_size, entry.path)
+               for entry in os.scandir(cache_dir) if entry.name.endswith('.json')]
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        os.remove(path)
+        total -= size
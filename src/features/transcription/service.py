@@ -3,12 +3,14 @@ Transcription Service
 Wraps Faster-Whisper for video transcription.
 Extracted from src/core/transcriber.py
 """
-from typing import Optional
+from functools import lru_cache
+from typing import Iterator, Optional
 from pathlib import Path
 from faster_whisper import WhisperModel
 
 from src.shared.models import Transcript, TranscriptSegment, Word
 from src.shared.exceptions import TranscriptionError, WhisperModelError, NoAudioError
+from .cache import load_cached_transcript, store_transcript, transcript_cache_key
 
 
 class TranscriptionService:
@@ -85,24 +87,8 @@ class TranscriptionService:
                 # Log progress if verbose
                 if verbose:
                     print(f"[{segment.start:.2f}s -> {segment.end:.2f}s] {segment.text}")
-
-                words = []
-                if segment.words:
-                    for word in segment.words:
-                        words.append(Word(
-                            text=word.word,
-                            start=word.start,
-                            end=word.end,
-                            probability=word.probability
-                        ))
                 
-                seg = TranscriptSegment(
-                    text=segment.text,
-                    start=segment.start,
-                    end=segment.end,
-                    words=words
-                )
-                transcript_segments.append(seg)
+                transcript_segments.append(_to_segment(segment))
                 full_text += segment.text + " "
             
             return Transcript(
@@ -116,9 +102,61 @@ class TranscriptionService:
                 raise
             raise TranscriptionError(f"Transcription failed: {e}")
     
+    def iter_transcript_windows(
+        self,
+        video_path: str | Path,
+        window_seconds: float,
+        word_timestamps: bool = True,
+        verbose: bool = False
+    ) -> Iterator[dict]:
+        """
+        Transcribe a video and yield it in consecutive windows as Whisper gets there.
+        
+        Faster-Whisper decodes lazily, so each window is available while later
+        audio is still being transcribed. Windows end on segment boundaries and
+        timestamps stay absolute, so windows can be used like full transcripts.
+        
+        Args:
+            video_path: Path to the video file
+            window_seconds: Approximate length of each window
+            word_timestamps: Whether to include word-level timestamps
+            verbose: Whether to print progress segments
+            
+        Yields:
+            Transcript dictionaries (same format as transcribe_to_dict), one per window
+            
+        Raises:
+            TranscriptionError: If transcription fails
+            WhisperModelError: If model fails to load
+        """
+        try:
+            model = self._load_model()
+            segments, info = model.transcribe(str(video_path), word_timestamps=word_timestamps)
+            
+            window = []
+            window_end = window_seconds
+            for segment in segments:
+                if verbose:
+                    print(f"[{segment.start:.2f}s -> {segment.end:.2f}s] {segment.text}")
+                window.append(_to_segment(segment))
+                
+                if segment.end >= window_end:
+                    yield _window_dict(window, info.language)
+                    window = []
+                    window_end = segment.end + window_seconds
+            
+            if window:
+                yield _window_dict(window, info.language)
+                
+        except Exception as e:
+            if isinstance(e, (TranscriptionError, WhisperModelError)):
+                raise
+            raise TranscriptionError(f"Transcription failed: {e}")
+    
     def transcribe_to_dict(self, video_path: str | Path, word_timestamps: bool = True, verbose: bool = False) -> dict:
         """
         Transcribe and return as dictionary for backward compatibility.
+        Results are cached on disk, so re-running on the same media is instant.
         
         Args:
             video_path: Path to the video file
@@ -128,8 +166,55 @@ class TranscriptionService:
         Returns:
             Dictionary with transcript data
         """
+        try:
+            key = transcript_cache_key(
+                video_path, self.model_size, self.compute_type, word_timestamps
+            )
+        except OSError:
+            key = None  # Unreadable here; let transcribe() report it
+        
+        if key is not None:
+            cached = load_cached_transcript(key)
+            if cached is not None:
+                if verbose:
+                    print("Using cached transcript")
+                return cached
+        
         transcript = self.transcribe(video_path, word_timestamps, verbose=verbose)
-        return transcript.to_dict()
+        result = transcript.to_dict()
+        if key is not None:
+            store_transcript(key, result)
+        return result
+
+
+def _to_segment(segment) -> TranscriptSegment:
+    """Convert a Faster-Whisper segment to our domain model"""
+    words = [
+        Word(
+            text=word.word,
+            start=word.start,
+            end=word.end,
+            probability=word.probability
+        )
+        for word in segment.words or ()
+    ]
+    return TranscriptSegment(
+        text=segment.text,
+        start=segment.start,
+        end=segment.end,
+        words=words
+    )
+
+
+def _window_dict(segments, language: str) -> dict:
+    text = "".join(f"{seg.text} " for seg in segments).strip()
+    return Transcript(text=text, segments=segments, language=language).to_dict()
+
+
+@lru_cache(maxsize=1)
+def _get_service(model_size: str, device: str, compute_type: str) -> TranscriptionService:
+    """Reuse one service (and its loaded Whisper model) across legacy calls"""
+    return TranscriptionService(model_size, device, compute_type)
 
 
 # Legacy function for backward compatibility
@@ -146,5 +231,5 @@ def transcribe_video(
     
     Returns a dictionary with full text, segments, and language info.
     """
-    service = TranscriptionService(model_size, device, compute_type)
+    service = _get_service(model_size, device, compute_type)
     return service.transcribe_to_dict(video_path, verbose=verbose)
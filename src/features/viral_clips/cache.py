@@ -0,0 +1,46 @@
+"""
+Analysis Cache
+Disk cache for Gemini viral-clip responses, keyed on the exact prompt and model.
+"""
+import hashlib
+import json
+import os
+from typing import List, Optional
+
+from src.shared.config import get_config
+
+
+def analysis_cache_key(model_name: str, prompt: str) -> str:
+    """
+    Hash of the model and the full prompt. The prompt embeds the transcript and
+    the video duration, so the same media analyzed again maps to the same key.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(model_name.encode())
+    digest.update(b'\0')
+    digest.update(prompt.encode())
+    return digest.hexdigest()
+
+
+def load_cached_clips(key: str) -> Optional[List[dict]]:
+    """Return the raw clip objects cached for key, or None on a miss"""
+    path = get_config().analysis_cache_dir / f"{key}.json"
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def store_clips(key: str, shorts: List[dict]):
+    """Write the clip objects of a complete response atomically"""
+    cache_dir = get_config().analysis_cache_dir
+    path = cache_dir / f"{key}.json"
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(shorts, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # Cache is best-effort
@@ -5,14 +5,16 @@ Extracted from src/core/analyzer.py
 """
 import os
 import json
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import Iterator, List, Dict, Optional
 from google import genai
 from rich.console import Console
-from rich.table import Table
 
+from src.shared.config import get_config
 from src.shared.models import ViralClip, TimeRange
 from src.shared.exceptions import GeminiAPIError, MissingAPIKeyError, NoViralClipsFoundError, InvalidPromptResponseError
 from .prompts import TITLE_PROMPT_TEMPLATE, DESCRIPTION_PROMPT_TEMPLATE, VIRAL_CLIPS_PROMPT_TEMPLATE
+from .cache import analysis_cache_key, load_cached_clips, store_clips
 
 
 class ViralClipsService:
@@ -125,6 +127,35 @@ class ViralClipsService:
             GeminiAPIError: If API call fails
             NoViralClipsFoundError: If no clips are found
         """
+        return list(self.stream_viral_clips(transcript_dict, video_duration, show_cost))
+    
+    def stream_viral_clips(
+        self,
+        transcript_dict: dict,
+        video_duration: float,
+        show_cost: bool = True
+    ) -> Iterator[ViralClip]:
+        """
+        Stream viral clip moments as Gemini generates them.
+        
+        Each clip is yielded as soon as its JSON object is complete, so callers
+        can start cutting the first clip while later ones are still being generated.
+        Complete responses are cached on disk by prompt, so re-running the same
+        transcript skips the Gemini call.
+        
+        Args:
+            transcript_dict: Transcript dictionary with 'text' and 'segments' keys
+            video_duration: Total video duration in seconds
+            show_cost: Whether to display token usage and cost
+            
+        Yields:
+            ViralClip objects in the order Gemini ranks them
+            
+        Raises:
+            GeminiAPIError: If API call fails
+            NoViralClipsFoundError: If no clips are found
+            InvalidPromptResponseError: If the response is not valid JSON
+        """
         # Extract words from transcript
         words = []
         for segment in transcript_dict['segments']:
@@ -137,51 +168,46 @@ class ViralClipsService:
         
         prompt = VIRAL_CLIPS_PROMPT_TEMPLATE.format(
             video_duration=video_duration,
-            transcript_text=json.dumps(transcript_dict['text']),
+            transcript_text=transcript_dict['text'],
             words_json=json.dumps(words)
         )
         
+        key = analysis_cache_key(self.model_name, prompt)
+        cached = load_cached_clips(key)
+        if cached:
+            self.console.print("[dim]Using cached Gemini analysis[/]")
+            for short in cached:
+                yield _to_viral_clip(short)
+            return
+        
         try:
-            response = self.client.models.generate_content(
+            stream = self.client.models.generate_content_stream(
                 model=self.model_name,
-                contents=prompt
+                contents=prompt,
+                config={'response_mime_type': 'application/json'}
             )
             
-            # Display cost if requested
-            if show_cost:
-                self._display_token_usage(response)
-            
-            # Clean markdown code blocks if present
-            text = response.text
-            if text.startswith("```json"):
-                text = text[7:]
-            if text.endswith("```"):
-                text = text[:-3]
-            text = text.strip()
+            parser = _ShortsStreamParser()
+            last_chunk = None
+            shorts = []
             
-            result_json = json.loads(text)
+            for chunk in stream:
+                last_chunk = chunk
+                for short in parser.feed(chunk.text or ""):
+                    shorts.append(short)
+                    yield _to_viral_clip(short)
             
-            # Convert to ViralClip objects
-            clips = []
-            for short in result_json.get('shorts', []):
-                clip = ViralClip(
-                    time_range=TimeRange(
-                        start=float(short['start']),
-                        end=float(short['end'])
-                    ),
-                    title=short.get('video_title_for_youtube_short', ''),
-                    descriptions={
-                        'tiktok': short.get('video_description_for_tiktok', ''),
-                        'instagram': short.get('video_description_for_instagram', ''),
-                        'youtube': short.get('video_title_for_youtube_short', '')
-                    }
-                )
-                clips.append(clip)
+            # Usage metadata is reported on the final chunk
+            if show_cost and last_chunk is not None:
+                self._display_token_usage(last_chunk)
             
-            if not clips:
+            if not shorts:
+                # Surface malformed output as a JSON error rather than "no clips"
+                parser.validate()
                 raise NoViralClipsFoundError("Gemini did not find any viral clips")
             
-            return clips
+            # Only a fully consumed response is cached
+            store_clips(key, shorts)
             
         except json.JSONDecodeError as e:
             raise InvalidPromptResponseError(f"Invalid JSON response from Gemini: {e}")
@@ -204,6 +230,15 @@ class ViralClipsService:
             output_cost = (output_tokens / 1_000_000) * output_price_per_million
             total_cost = input_cost + output_cost
             
+            if not self.console.is_terminal:
+                # Headless workers get a single log line instead of a table
+                self.console.print(
+                    f"tokens in={prompt_tokens} out={output_tokens} $={total_cost:.6f}",
+                    highlight=False
+                )
+                return
+            
+            from rich.table import Table
             table = Table(
                 title=f"💰 Token Usage ({self.model_name})",
                 show_header=True,
@@ -222,15 +257,92 @@ class ViralClipsService:
             pass  # Silently ignore cost calculation errors
 
 
+def _to_viral_clip(short: dict) -> ViralClip:
+    """Build a ViralClip from one clip object of Gemini's response"""
+    return ViralClip(
+        time_range=TimeRange(
+            start=float(short['start']),
+            end=float(short['end'])
+        ),
+        title=short.get('video_title_for_youtube_short', ''),
+        descriptions={
+            'tiktok': short.get('video_description_for_tiktok', ''),
+            'instagram': short.get('video_description_for_instagram', ''),
+            'youtube': short.get('video_title_for_youtube_short', '')
+        }
+    )
+
+
+class _ShortsStreamParser:
+    """
+    Incrementally extracts the objects of the top-level "shorts" array from a
+    streamed JSON response, yielding each one as soon as it closes.
+    """
+    
+    def __init__(self):
+        self._buffer = ""
+        self._pos = None  # Index just past the '[' of the shorts array
+        self._done = False
+        self._decoder = json.JSONDecoder()
+    
+    def feed(self, text: str) -> Iterator[dict]:
+        """Append a streamed chunk and yield every clip object completed by it"""
+        self._buffer += text
+        
+        if self._pos is None:
+            key = self._buffer.find('"shorts"')
+            bracket = self._buffer.find('[', key) if key != -1 else -1
+            if bracket == -1:
+                return
+            self._pos = bracket + 1
+        
+        buf = self._buffer
+        while not self._done:
+            pos = self._pos
+            while pos < len(buf) and buf[pos] in ' \t\r\n,':
+                pos += 1
+            self._pos = pos
+            
+            if pos >= len(buf):
+                return
+            if buf[pos] == ']':
+                self._done = True
+                return
+            
+            try:
+                obj, end = self._decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                return  # Object not complete yet, wait for more text
+            
+            self._pos = end
+            yield obj
+    
+    def validate(self):
+        """Parse the full buffered response, raising JSONDecodeError if malformed"""
+        # Clean markdown code blocks if present
+        text = self._buffer.strip()
+        if text.startswith("```json"):
+            text = text[7:]
+        if text.endswith("```"):
+            text = text[:-3]
+        json.loads(text.strip())
+
+
+@lru_cache(maxsize=1)
+def _get_service(api_key: str, model_name: str = "gemini-2.5-flash") -> ViralClipsService:
+    """Reuse one service (and its Gemini client) across legacy calls"""
+    return ViralClipsService(api_key=api_key, model_name=model_name)
+
+
 # Legacy functions for backward compatibility
 def generate_viral_title(transcript_text: str) -> List[str]:
     """Legacy function for backward compatibility"""
-    api_key = os.getenv("GEMINI_API_KEY")
+    api_key = get_config().gemini_api_key
     if not api_key:
         return []
     
     try:
-        service = ViralClipsService(api_key=api_key)
+        service = _get_service(api_key)
         return service.generate_viral_titles(transcript_text)
     except Exception:
         return []
@@ -238,12 +350,12 @@ def generate_viral_title(transcript_text: str) -> List[str]:
 
 def generate_video_descriptions(transcript_text: str, video_title: str = "") -> Dict[str, str]:
     """Legacy function for backward compatibility"""
-    api_key = os.getenv("GEMINI_API_KEY")
+    api_key = get_config().gemini_api_key
     if not api_key:
         return {"tiktok": "", "instagram": "", "youtube": ""}
     
     try:
-        service = ViralClipsService(api_key=api_key)
+        service = _get_service(api_key)
         return service.generate_platform_descriptions(transcript_text, video_title)
     except Exception:
         return {"tiktok": "", "instagram": "", "youtube": ""}
@@ -254,13 +366,13 @@ def get_viral_clips(transcript_result: dict, video_duration: float) -> Optional[
     Legacy function for backward compatibility.
     Returns dict format expected by existing code.
     """
-    api_key = os.getenv("GEMINI_API_KEY")
+    api_key = get_config().gemini_api_key
     if not api_key:
         print("❌ Error: GEMINI_API_KEY not found in environment variables.")
         return None
     
     try:
-        service = ViralClipsService(api_key=api_key)
+        service = _get_service(api_key)
         clips = service.find_viral_clips(transcript_result, video_duration)
         
         # Convert back to old format
@@ -19,12 +19,23 @@ def main():
 # Backward compatibility exports
 # These allow existing code (like start_worker.py or tests) to import from src.main
 # effectively making src/main.py a facade for the new modular architecture.
-try:
-    from src.workflows.pipeline import run_pipeline
-    from src.workflows.use_cases import run_subtitles_only
-except ImportError:
-    # If run standalone or strictly for CLI, these might not be needed immediately,
-    # but practically they should exist.
-    pass
+# Resolved lazily (PEP 562) so importing src.main for the menu doesn't pull in
+# the cropping/YOLO stack until a pipeline actually runs.
+_LAZY_EXPORTS = {
+    'run_pipeline': 'src.workflows.pipeline',
+    'run_subtitles_only': 'src.workflows.use_cases',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    import importlib
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
 
 __all__ = ['main', 'run_pipeline', 'run_subtitles_only']
@@ -28,8 +28,33 @@ from .exceptions import (
 )
 
 from .config import get_config, AppConfig
-from .ffmpeg import get_video_info, get_video_resolution, cut_video, extract_audio, burn_subtitles
-from .youtube import download_youtube_video, sanitize_filename
+from .paths import sanitize_filename
+
+# FFmpeg and download helpers are resolved lazily (PEP 562): every submodule
+# import (e.g. src.shared.config) runs this file, and those pull in PyAV/yt-dlp
+_LAZY_EXPORTS = {
+    **dict.fromkeys((
+        'get_video_info',
+        'get_video_resolution',
+        'get_keyframe_times',
+        'snap_cut_to_keyframes',
+        'cut_video',
+        'extract_audio',
+        'burn_subtitles',
+    ), '.ffmpeg'),
+    'download_youtube_video': '.youtube',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    import importlib
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
 
 __all__ = [
     # Models
@@ -57,6 +82,8 @@ __all__ = [
     # FFmpeg utils
     'get_video_info',
     'get_video_resolution',
+    'get_keyframe_times',
+    'snap_cut_to_keyframes',
     'cut_video',
     'extract_audio',
     'burn_subtitles',
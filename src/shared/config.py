@@ -4,6 +4,7 @@ Centralized configuration for the application.
 """
 import os
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from dotenv import load_dotenv
@@ -12,25 +13,49 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
-@dataclass
+def _default_clip_workers() -> int:
+    """OPUS_CLIP_WORKERS if it is a positive integer, else half the cores"""
+    default = max(1, (os.cpu_count() or 2) // 2)
+    value = os.getenv("OPUS_CLIP_WORKERS")
+    if not value:
+        return default
+    try:
+        workers = int(value)
+    except ValueError:
+        workers = 0
+    if workers < 1:
+        print(f"⚠️ OPUS_CLIP_WORKERS={value!r} is not a positive integer; using {default}")
+        return default
+    return workers
+
+
+@dataclass(frozen=True)
 class AppConfig:
-    """Main application configuration"""
+    """
+    Main application configuration.
+    Frozen so the shared instance is hashable, thread-safe and can be pickled
+    by value into clip worker processes.
+    """
     
     # API Keys
     gemini_api_key: Optional[str] = field(default_factory=lambda: os.getenv("GEMINI_API_KEY"))
     
     # Directories
     project_root: Path = field(default_factory=lambda: Path(__file__).parent.parent.parent)
+    assets_dir: Path = field(init=False)
     input_dir: Path = field(init=False)
     output_dir: Path = field(init=False)
     media_dir: Path = field(init=False)
     music_dir: Path = field(init=False)
     models_dir: Path = field(init=False)
+    transcript_cache_dir: Path = field(init=False)
+    analysis_cache_dir: Path = field(init=False)
     
     # Transcription settings
     whisper_model: str = "base"  # tiny, base, small, medium, large
     whisper_device: str = "cpu"  # cpu, cuda
     whisper_compute_type: str = "int8"
+    transcript_cache_max_gb: float = 1.0  # Cached transcripts beyond this are evicted, oldest use first
     
     # Video output settings
     output_width: int = 1080
@@ -38,7 +63,7 @@ class AppConfig:
     output_fps: int = 30
     
     # Encoding settings
-    video_codec: str = "libx264"
+    video_codec: str = "auto"  # auto (hardware if available), libx264, h264_nvenc, h264_qsv, h264_videotoolbox
     audio_codec: str = "aac"
     preset: str = "fast"  # ultrafast, superfast, veryfast, faster, fast, medium, slow, slower, veryslow
     crf: int = 23  # 0-51, lower = better quality, 18-28 is good range
@@ -50,18 +75,30 @@ class AppConfig:
     
     # AI settings
     gemini_model: str = "gemini-2.5-flash"
+    # >0: analyze the transcript in windows of this many seconds while Whisper
+    # keeps going (long videos); 0 waits for the full transcript. OPUS_ANALYSIS_WINDOW overrides
+    analysis_window_seconds: float = field(
+        default_factory=lambda: float(os.getenv("OPUS_ANALYSIS_WINDOW") or 0)
+    )
     
     # Cropping settings
     aspect_ratio: float = 9 / 16  # For vertical videos
     
+    # Parallelism: clips processed at once (half the cores by default; OPUS_CLIP_WORKERS overrides)
+    clip_workers: int = field(default_factory=_default_clip_workers)
+    
     def __post_init__(self):
         """Initialize directory paths"""
-        self.assets_dir = self.project_root / "assets"
-        self.input_dir = self.assets_dir / "input"
-        self.output_dir = self.assets_dir / "output"
-        self.media_dir = self.assets_dir / "media"
-        self.music_dir = self.assets_dir / "music"
-        self.models_dir = self.project_root / "src" / "models"
+        # Frozen dataclass: derived fields are set once here, bypassing __setattr__
+        assets_dir = self.project_root / "assets"
+        object.__setattr__(self, 'assets_dir', assets_dir)
+        object.__setattr__(self, 'input_dir', assets_dir / "input")
+        object.__setattr__(self, 'output_dir', assets_dir / "output")
+        object.__setattr__(self, 'media_dir', assets_dir / "media")
+        object.__setattr__(self, 'music_dir', assets_dir / "music")
+        object.__setattr__(self, 'models_dir', self.project_root / "src" / "models")
+        object.__setattr__(self, 'transcript_cache_dir', assets_dir / ".transcripts")
+        object.__setattr__(self, 'analysis_cache_dir', assets_dir / ".analysis")
         
         # Create directories if they don't exist
         for dir_path in [self.input_dir, self.output_dir, self.media_dir, self.music_dir]:
@@ -93,18 +130,23 @@ class AppConfig:
         if not (0 <= self.crf <= 51):
             raise ConfigurationError(f"CRF must be between 0 and 51, got: {self.crf}")
         
+        if self.clip_workers < 1:
+            raise ConfigurationError(f"clip_workers must be at least 1, got: {self.clip_workers}")
+        
         return True
     
+    @property
+    def ffmpeg_threads_per_clip(self) -> int:
+        """FFmpeg -threads for one clip job, so clip_workers concurrent jobs share the cores"""
+        return max(1, (os.cpu_count() or 1) // self.clip_workers)
+    
     @property
     def has_gemini_key(self) -> bool:
         """Check if Gemini API key is configured"""
         return bool(self.gemini_api_key and self.gemini_api_key.strip())
 
 
-# Global configuration instance
-_config: Optional[AppConfig] = None
-
-
+@lru_cache(maxsize=1)
 def get_config() -> AppConfig:
     """
     Get or create the global configuration instance.
@@ -112,13 +154,9 @@ def get_config() -> AppConfig:
     Returns:
         AppConfig instance
     """
-    global _config
-    if _config is None:
-        _config = AppConfig()
-    return _config
+    return AppConfig()
 
 
 def reset_config():
     """Reset the global configuration (useful for testing)"""
-    global _config
-    _config = None
+    get_config.cache_clear()
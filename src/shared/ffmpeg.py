@@ -3,17 +3,58 @@ FFmpeg Wrapper Utilities
 Provides high-level functions for common FFmpeg operations.
 Extracted from various modules to centralize FFmpeg interactions.
 """
+import atexit
+import bisect
+import json
+import multiprocessing
+import os
+import shutil
 import subprocess
-import cv2
+from functools import lru_cache
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
 from .models import VideoInfo
-from .exceptions import FFmpegError, VideoNotFoundError, VideoCorruptedError
+from .exceptions import ConfigurationError, FFmpegError, VideoNotFoundError, VideoCorruptedError
+from .config import get_config
+from .mp4 import MP4_EXTENSIONS, mp4_probe
+from .ffmpeg_pool import run_ffmpeg
+
+try:
+    import av  # PyAV: in-process libav, used for metadata probing when installed
+except ImportError:
+    av = None
+
+# Max drift (seconds) accepted from a stream-copy cut before re-encoding
+COPY_CUT_TOLERANCE = 0.25
+
+# Static argument fragments shared by the command builders
+_COPY_CUT_ARGS = ('-c', 'copy', '-avoid_negative_ts', 'make_zero')
+_AAC_AUDIO_ARGS = ('-c:a', 'aac')
+# Regenerate missing input PTS instead of failing on them
+_GENPTS_INPUT_ARGS = ('-fflags', '+genpts')
+# moov atom up front so later probes and uploads don't seek to EOF; no timecode track
+_MP4_OUTPUT_ARGS = ('-movflags', '+faststart', '-write_tmcd', '0')
+
+# Hardware H.264 encoders in order of preference. VAAPI is left out because it
+# needs a device path and an explicit hwupload filter chain.
+HW_H264_ENCODERS = ('h264_nvenc', 'h264_videotoolbox', 'h264_qsv')
+
+# Probe results survive across runs in assets/.probe_cache.json
+PROBE_CACHE_SIZE = 512
+# Part of every persisted key; bumped when the probe tuple's meaning changes
+# (2: width/height are the display geometry, after rotation metadata)
+PROBE_CACHE_VERSION = 2
+_persisted_probes: Optional[dict] = None
+_probes_dirty = False
 
 
 def get_video_info(video_path: str) -> VideoInfo:
     """
-    Extract video metadata using OpenCV.
+    Extract video metadata. MP4/MOV files are read straight from their moov box;
+    anything else (or an MP4 that can't be parsed) goes to PyAV when installed,
+    else ffprobe, else OpenCV if ffprobe is not installed either.
+    Results are cached per (path, mtime, size) in memory and on disk, so repeated
+    lookups of the same unchanged file don't reopen the container.
     
     Args:
         video_path: Path to video file
@@ -26,10 +67,150 @@ def get_video_info(video_path: str) -> VideoInfo:
         VideoCorruptedError: If file cannot be read
     """
     path = Path(video_path)
-    if not path.exists():
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
         raise VideoNotFoundError(f"Video not found: {video_path}")
     
-    cap = cv2.VideoCapture(str(video_path))
+    width, height, fps, frame_count, duration, has_audio = _probe(
+        str(path), stat.st_mtime_ns, stat.st_size
+    )
+    return VideoInfo(
+        path=path,
+        width=width,
+        height=height,
+        fps=fps,
+        duration=duration,
+        has_audio=has_audio,
+        frame_count=frame_count
+    )
+
+
+@lru_cache(maxsize=PROBE_CACHE_SIZE)
+def _probe(video_path: str, mtime_ns: int, size: int) -> tuple:
+    """
+    Returns (width, height, fps, frame_count, duration, has_audio), with width and
+    height as displayed: swapped for video stored sideways with rotation metadata,
+    matching the upright frames ffmpeg's default autorotation decodes.
+    mtime/size are only part of the cache key, so an edited file is re-probed.
+    """
+    global _probes_dirty
+    
+    persisted = _load_probe_cache()
+    key = f"{PROBE_CACHE_VERSION}|{video_path}|{mtime_ns}|{size}"
+    if key in persisted:
+        return tuple(persisted[key])
+    
+    result = _probe_file(video_path)
+    persisted[key] = list(result)
+    _probes_dirty = True
+    return result
+
+
+def _probe_file(video_path: str) -> tuple:
+    """Uncached probe, for files that are checked once and shouldn't fill the caches"""
+    # Plain MP4/MOV: the moov box has everything, no decoder or subprocess needed
+    result = mp4_probe(video_path) if video_path.lower().endswith(MP4_EXTENSIONS) else None
+    if result is not None:
+        return result
+    if av is not None:
+        return _probe_with_pyav(video_path)
+    try:
+        return _probe_with_ffprobe(video_path)
+    except FileNotFoundError:
+        return _probe_with_opencv(video_path)
+
+
+def _probe_with_pyav(video_path: str) -> tuple:
+    """In-process probe: only the container headers are read, no subprocess"""
+    try:
+        container = av.open(video_path)
+    except av.error.FFmpegError:
+        raise VideoCorruptedError(f"Cannot open video: {video_path}")
+    
+    with container:
+        if not container.streams.video:
+            raise VideoCorruptedError(f"No video stream found: {video_path}")
+        stream = container.streams.video[0]
+        
+        fps = float(stream.average_rate or stream.guessed_rate or 0)
+        if stream.duration is not None and stream.time_base is not None:
+            duration = float(stream.duration * stream.time_base)
+        else:
+            duration = (container.duration or 0) / av.time_base
+        frame_count = stream.frames or int(round(duration * fps))
+        has_audio = bool(container.streams.audio)
+        width, height = stream.codec_context.width, stream.codec_context.height
+        if _pyav_rotation(container, stream) % 180:
+            width, height = height, width
+        
+        return width, height, fps, frame_count, duration, has_audio
+
+
+def _pyav_rotation(container, stream) -> int:
+    """
+    Display rotation in degrees. PyAV doesn't expose the stream's display matrix,
+    so unless the legacy 'rotate' tag is set, it is read off the first frame.
+    """
+    tag = stream.metadata.get('rotate')
+    if tag:
+        return int(float(tag))
+    try:
+        frame = next(container.decode(stream), None)
+    except av.error.FFmpegError:
+        return 0
+    return int(getattr(frame, 'rotation', 0) or 0)
+
+
+def _probe_with_ffprobe(video_path: str) -> tuple:
+    """Single ffprobe call: video stream geometry/timing plus audio presence"""
+    command = [
+        'ffprobe', '-v', 'error',
+        '-show_entries',
+        'stream=codec_type,width,height,r_frame_rate,nb_frames,duration'
+        ':stream_tags=rotate:stream_side_data=rotation:format=duration',
+        '-of', 'json',
+        video_path
+    ]
+    result = subprocess.run(command, capture_output=True, start_new_session=True)
+    if result.returncode != 0:
+        raise VideoCorruptedError(f"Cannot open video: {video_path}")
+    
+    data = json.loads(result.stdout or b'{}')
+    streams = data.get('streams', [])
+    video = next((st for st in streams if st.get('codec_type') == 'video'), None)
+    if video is None:
+        raise VideoCorruptedError(f"No video stream found: {video_path}")
+    
+    num, _, den = video.get('r_frame_rate', '0/1').partition('/')
+    den = float(den or 1)
+    fps = float(num) / den if den else 0.0
+    duration = float(video.get('duration') or data.get('format', {}).get('duration') or 0.0)
+    if video.get('nb_frames'):
+        frame_count = int(video['nb_frames'])
+    else:
+        frame_count = int(round(duration * fps))
+    has_audio = any(st.get('codec_type') == 'audio' for st in streams)
+    
+    width, height = int(video['width']), int(video['height'])
+    rotation = video.get('tags', {}).get('rotate') or next(
+        (sd['rotation'] for sd in video.get('side_data_list', ()) if 'rotation' in sd), 0
+    )
+    if int(float(rotation)) % 180:
+        width, height = height, width
+    
+    return width, height, fps, frame_count, duration, has_audio
+
+
+def _probe_with_opencv(video_path: str) -> tuple:
+    """
+    Fallback when ffprobe isn't installed. OpenCV can't see audio streams, so
+    has_audio stays True and audio steps fall back to ffmpeg's own '?' mapping.
+    OpenCV autorotates, so its frame size is already the display geometry.
+    """
+    import cv2  # Only this fallback needs OpenCV
+    
+    cap = cv2.VideoCapture(video_path)
     if not cap.isOpened():
         raise VideoCorruptedError(f"Cannot open video: {video_path}")
     
@@ -39,26 +220,54 @@ def get_video_info(video_path: str) -> VideoInfo:
         fps = cap.get(cv2.CAP_PROP_FPS)
         frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
         duration = frame_count / fps if fps > 0 else 0.0
-        
-        # Check if video has audio (we'll assume yes for now, can be checked with ffprobe)
-        has_audio = True
-        
-        return VideoInfo(
-            path=path,
-            width=width,
-            height=height,
-            fps=fps,
-            duration=duration,
-            has_audio=has_audio
-        )
+        return width, height, fps, frame_count, duration, True
     finally:
         cap.release()
 
 
+def _probe_cache_path() -> Path:
+    return get_config().assets_dir / ".probe_cache.json"
+
+
+def _load_probe_cache() -> dict:
+    """Load persisted probe results once per process"""
+    global _persisted_probes
+    if _persisted_probes is None:
+        try:
+            with open(_probe_cache_path(), 'r', encoding='utf-8') as f:
+                _persisted_probes = json.load(f)
+        except (OSError, ValueError):
+            _persisted_probes = {}
+    return _persisted_probes
+
+
+def _save_probe_cache():
+    """Write new probe results back to disk on exit (atomically, newest entries kept)"""
+    if not _probes_dirty or not _persisted_probes:
+        return
+    
+    entries = list(_persisted_probes.items())[-PROBE_CACHE_SIZE:]
+    cache_path = _probe_cache_path()
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(entries), f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # Cache is best-effort
+
+
+# Only the main process writes the cache back. Spawned clip workers import this
+# module too, and each would overwrite the file with its own partial view.
+if multiprocessing.parent_process() is None:
+    atexit.register(_save_probe_cache)
+
+
 def get_video_resolution(video_path: str) -> Tuple[int, int]:
     """
     Get video resolution (width, height).
-    Legacy function for compatibility.
+    Legacy function for compatibility. Served from the cached metadata probe
+    (keyed on path, mtime and size), so no decoder is ever opened for it.
     
     Args:
         video_path: Path to video file
@@ -70,7 +279,227 @@ def get_video_resolution(video_path: str) -> Tuple[int, int]:
     return info.width, info.height
 
 
-def cut_video(input_path: str, output_path: str, start: float, end: float, re_encode: bool = True) -> None:
+def format_timestamp(seconds: float) -> str:
+    """
+    Format seconds for -ss/-to: fixed microsecond precision (FFmpeg's own time base)
+    instead of repr()'s up-to-17 digits, so a keyframe time is never rounded past.
+    """
+    return f"{seconds:.6f}"
+
+
+@lru_cache(maxsize=16)
+def video_encoder_args(
+    encoder: str,
+    crf: int = 23,
+    x264_preset: str = 'fast',
+    x264_tune: Optional[str] = None
+) -> Tuple[str, ...]:
+    """
+    Build the video codec arguments for an H.264 encoder at roughly the same quality.
+    
+    Args:
+        encoder: Encoder name as returned by get_h264_encoder()
+        crf: x264 CRF; mapped to the closest quality knob of hardware encoders
+        x264_preset: Preset used when the encoder is libx264
+        x264_tune: Optional -tune used when the encoder is libx264
+        
+    Returns:
+        Tuple of FFmpeg arguments starting with '-c:v' (cached, so splat it into commands)
+        
+    Raises:
+        ConfigurationError: If encoder is not one of the supported H.264 encoders
+    """
+    if encoder == 'h264_nvenc':
+        return ('-c:v', encoder, '-preset', 'p4', '-rc', 'vbr', '-cq', str(crf), '-b:v', '0', '-pix_fmt', 'yuv420p')
+    if encoder == 'h264_videotoolbox':
+        return ('-c:v', encoder, '-b:v', '8M', '-pix_fmt', 'yuv420p')
+    if encoder == 'h264_qsv':
+        return ('-c:v', encoder, '-preset', 'medium', '-global_quality', str(crf), '-pix_fmt', 'nv12')
+    if encoder != 'libx264':
+        raise ConfigurationError(
+            f"Unsupported video codec '{encoder}' "
+            "(use auto, libx264, h264_nvenc, h264_qsv or h264_videotoolbox)"
+        )
+    
+    args = ('-c:v', 'libx264', '-preset', x264_preset)
+    if x264_tune:
+        args += ('-tune', x264_tune)
+    return args + ('-crf', str(crf), '-pix_fmt', 'yuv420p')
+
+
+@lru_cache(maxsize=1)
+def _detect_hw_encoder() -> str:
+    """
+    Find the first hardware H.264 encoder that is both compiled into FFmpeg and
+    actually usable on this machine (static builds list NVENC without a GPU).
+    Runs once per process.
+    """
+    try:
+        result = subprocess.run(
+            ['ffmpeg', '-hide_banner', '-encoders'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            start_new_session=True
+        )
+    except FileNotFoundError:
+        return 'libx264'
+    
+    for encoder in HW_H264_ENCODERS:
+        if f" {encoder} " not in result.stdout:
+            continue
+        # One-frame trial encode to confirm the device/driver is present
+        trial = subprocess.run(
+            ['ffmpeg', '-hide_banner', '-loglevel', 'error',
+             '-f', 'lavfi', '-i', 'color=black:s=256x256:d=0.1',
+             '-frames:v', '1', *video_encoder_args(encoder), '-f', 'null', '-'],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+        if trial.returncode == 0:
+            return encoder
+    return 'libx264'
+
+
+def get_h264_encoder(video_codec: Optional[str] = None) -> str:
+    """
+    Get the H.264 encoder to use.
+    
+    'auto' picks a working hardware encoder if available, else libx264; any other
+    value is used as-is. Set OPUS_FORCE_CPU_ENCODE=1 to always use libx264.
+    
+    Args:
+        video_codec: Encoder override (default: AppConfig.video_codec)
+    
+    Returns:
+        FFmpeg encoder name
+    """
+    if os.getenv('OPUS_FORCE_CPU_ENCODE') == '1':
+        return 'libx264'
+    if video_codec is None:
+        video_codec = get_config().video_codec
+    if video_codec != 'auto':
+        return video_codec
+    return _detect_hw_encoder()
+
+
+def hw_decode_args(encoder: str) -> List[str]:
+    """
+    Input-side -hwaccel arguments to pair with encoder. Hardware decode only pays
+    off alongside a hardware encoder; frames are still downloaded to system memory
+    so CPU filters (subtitles) keep working.
+    """
+    return [] if encoder == 'libx264' else ['-hwaccel', 'auto']
+
+
+def get_keyframe_times(video_path: str) -> Tuple[float, ...]:
+    """
+    Get the presentation times of the video keyframes, in ascending order.
+    Cached per file (path, mtime, size), so repeated cuts of one source probe once.
+    
+    Args:
+        video_path: Path to video file
+        
+    Returns:
+        Keyframe timestamps in seconds (empty if ffprobe is unavailable)
+    """
+    if not os.path.exists(video_path):
+        raise VideoNotFoundError(f"Video not found: {video_path}")
+    
+    stat = os.stat(video_path)
+    return _keyframe_times(video_path, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=32)
+def _keyframe_times(video_path: str, mtime_ns: int, size: int) -> Tuple[float, ...]:
+    # Packet flags carry the keyframe marker, so nothing has to be decoded
+    command = [
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'packet=pts_time,flags',
+        '-of', 'csv=p=0',
+        video_path
+    ]
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, start_new_session=True)
+    except FileNotFoundError:
+        return ()
+    if result.returncode != 0:
+        return ()
+    
+    times = []
+    for line in result.stdout.splitlines():
+        pts_time, _, flags = line.partition(',')
+        if 'K' in flags and pts_time not in ('', 'N/A'):
+            times.append(float(pts_time))
+    return tuple(sorted(times))
+
+
+def snap_cut_to_keyframes(video_path: str, start: float, end: float) -> Optional[Tuple[float, float]]:
+    """
+    Widen [start, end] to the surrounding keyframes so a stream copy needs no re-encode.
+    
+    Args:
+        video_path: Path to video file
+        start: Requested start time in seconds
+        end: Requested end time in seconds
+        
+    Returns:
+        (start, end) moved down/up to the nearest keyframes, or None if no keyframes are known
+    """
+    times = get_keyframe_times(video_path)
+    if not times:
+        return None
+    
+    i = bisect.bisect_right(times, start)
+    snapped_start = times[i - 1] if i else start
+    j = bisect.bisect_left(times, end)
+    # Past the last keyframe the copy simply runs to the requested end
+    snapped_end = times[j] if j < len(times) else end
+    return snapped_start, snapped_end
+
+
+def _build_copy_cut_cmd(input_path: str, output_path: str, start: float, end: float) -> List[str]:
+    return [
+        'ffmpeg', '-y',
+        '-ss', format_timestamp(start),
+        '-to', format_timestamp(end),
+        '-i', input_path,
+        *_COPY_CUT_ARGS,
+        output_path
+    ]
+
+
+def _build_cut_cmd(
+    input_path: str,
+    output_path: str,
+    start: float,
+    end: float,
+    video_codec: Optional[str] = None
+) -> List[str]:
+    return [
+        'ffmpeg', '-y',
+        *_GENPTS_INPUT_ARGS,
+        '-ss', format_timestamp(start),
+        '-to', format_timestamp(end),
+        '-i', input_path,
+        *video_encoder_args(get_h264_encoder(video_codec)),
+        *_AAC_AUDIO_ARGS,
+        *_MP4_OUTPUT_ARGS,
+        output_path
+    ]
+
+
+def cut_video(
+    input_path: str,
+    output_path: str,
+    start: float,
+    end: float,
+    re_encode: bool = True,
+    video_codec: Optional[str] = None,
+    snap_to_keyframes: bool = False
+) -> Tuple[float, float]:
     """
     Cut a segment from a video.
     
@@ -79,39 +508,69 @@ def cut_video(input_path: str, output_path: str, start: float, end: float, re_en
         output_path: Destination video path
         start: Start time in seconds
         end: End time in seconds
-        re_encode: If True, re-encode for frame accuracy. If False, use stream copy (faster but less precise)
+        re_encode: If True, re-encode for frame accuracy. If False, try a stream copy first
+            and only re-encode if the copied segment's duration is off by more than
+            COPY_CUT_TOLERANCE (i.e. the cut did not land close enough to a keyframe)
+        video_codec: Encoder override, 'auto' for hardware detection (default: AppConfig.video_codec)
+        snap_to_keyframes: If True, widen the cut to the surrounding keyframes and stream copy
+            it (overrides re_encode). Re-encodes instead if no keyframes can be probed
+        
+    Returns:
+        The (start, end) actually cut, so callers can align subtitles to snapped times
         
     Raises:
         FFmpegError: If FFmpeg command fails
     """
-    if re_encode:
-        command = [
-            'ffmpeg', '-y',
-            '-ss', str(start),
-            '-to', str(end),
-            '-i', input_path,
-            '-c:v', 'libx264', '-preset', 'fast', '-crf', '23',
-            '-c:a', 'aac',
-            output_path
-        ]
-    else:
-        command = [
-            'ffmpeg', '-y',
-            '-ss', str(start),
-            '-to', str(end),
-            '-i', input_path,
-            '-c', 'copy',
-            output_path
-        ]
+    snapped = snap_cut_to_keyframes(input_path, start, end) if snap_to_keyframes else None
+    if snapped is not None:
+        start, end = snapped
+        command = _build_copy_cut_cmd(input_path, output_path, start, end)
+        returncode, stderr = run_ffmpeg(command)
+        
+        if returncode != 0:
+            raise FFmpegError(
+                f"Failed to copy video from {start}s to {end}s",
+                command=' '.join(command),
+                stderr=stderr or None
+            )
+        return start, end
     
-    result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if not re_encode:
+        command = _build_copy_cut_cmd(input_path, output_path, start, end)
+        returncode, stderr = run_ffmpeg(command)
+        
+        if returncode == 0:
+            # A throwaway check of a fresh output: probed, but not cached
+            try:
+                copied = _probe_file(str(output_path))[4]
+            except (VideoNotFoundError, VideoCorruptedError):
+                copied = None
+            if copied is not None and abs(copied - (end - start)) <= COPY_CUT_TOLERANCE:
+                return start, end
+        # Not keyframe-aligned (or copy failed): fall through to a precise re-encode
     
-    if result.returncode != 0:
+    command = _build_cut_cmd(input_path, output_path, start, end, video_codec)
+    
+    returncode, stderr = run_ffmpeg(command)
+    
+    if returncode != 0:
         raise FFmpegError(
             f"Failed to cut video from {start}s to {end}s",
             command=' '.join(command),
-            stderr=result.stderr.decode() if result.stderr else None
+            stderr=stderr or None
         )
+    
+    return start, end
+
+
+def _build_extract_audio_cmd(video_path: str, output_path: str, audio_codec: str) -> List[str]:
+    return [
+        'ffmpeg', '-y',
+        '-i', video_path,
+        '-vn',  # No video
+        '-acodec', audio_codec,
+        output_path
+    ]
 
 
 def extract_audio(video_path: str, output_path: str, audio_codec: str = 'copy') -> None:
@@ -124,45 +583,36 @@ def extract_audio(video_path: str, output_path: str, audio_codec: str = 'copy')
         audio_codec: Audio codec to use ('copy' for stream copy, 'aac', 'mp3', etc.)
         
     Raises:
-        FFmpegError: If FFmpeg command fails
+        FFmpegError: If the video has no audio track or the FFmpeg command fails
     """
-    command = [
-        'ffmpeg', '-y',
-        '-i', video_path,
-        '-vn',  # No video
-        '-acodec', audio_codec,
-        output_path
-    ]
+    # The probe is cached, so this costs nothing next to spawning an ffmpeg that would fail
+    if not get_video_info(video_path).has_audio:
+        raise FFmpegError(f"No audio track in {video_path}")
     
-    result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    command = _build_extract_audio_cmd(video_path, output_path, audio_codec)
     
-    if result.returncode != 0:
+    returncode, stderr = run_ffmpeg(command)
+    
+    if returncode != 0:
         raise FFmpegError(
             f"Failed to extract audio from {video_path}",
             command=' '.join(command),
-            stderr=result.stderr.decode() if result.stderr else None
+            stderr=stderr or None
         )
 
 
-def burn_subtitles(
-    video_path: str,
-    srt_path: str,
-    output_path: str,
-    alignment: str = "bottom",
-    fontsize: int = 16
-) -> None:
+@lru_cache(maxsize=8)
+def build_subtitle_style(alignment: str = "bottom", fontsize: int = 16) -> str:
     """
-    Burn subtitles into video using FFmpeg.
+    Build the ASS force_style override for burned-in subtitles.
+    Cached so a batch of clips with identical styling shares one string.
     
     Args:
-        video_path: Source video path
-        srt_path: SRT subtitle file path
-        output_path: Destination video path
         alignment: Subtitle alignment ('top', 'middle', 'bottom')
         fontsize: Font size multiplier
         
-    Raises:
-        FFmpegError: If FFmpeg command fails
+    Returns:
+        Comma-separated ASS style overrides
     """
     final_fontsize = int(fontsize * 0.5)
     if final_fontsize < 8:
@@ -170,18 +620,12 @@ def burn_subtitles(
 
     # ASS alignment values
     ass_alignment = 2  # Default Bottom
-    if alignment.lower() == 'top':
+    if alignment == 'top':
         ass_alignment = 6
-    elif alignment.lower() == 'middle':
+    elif alignment == 'middle':
         ass_alignment = 10
 
-    # Sanitize path for FFmpeg filter
-    try:
-        safe_srt_path = srt_path.replace('\\', '/').replace(':', '\\:')
-    except:
-        safe_srt_path = srt_path
-
-    style_string = (
+    return (
         f"Alignment={ass_alignment},"
         f"Fontname=Verdana,"
         f"Fontsize={final_fontsize},"
@@ -194,26 +638,82 @@ def burn_subtitles(
         f"MarginV=25,"
         f"Bold=1"
     )
+
+
+def _build_burn_cmd(
+    video_path: str,
+    srt_path: str,
+    output_path: str,
+    alignment: str,
+    fontsize: int,
+    video_codec: Optional[str] = None
+) -> List[str]:
+    # Sanitize path for FFmpeg filter (str() also accepts Path objects)
+    safe_srt_path = str(srt_path).replace('\\', '/').replace(':', '\\:')
+
+    style_string = build_subtitle_style(alignment.lower(), fontsize)
+    encoder = get_h264_encoder(video_codec)
     
-    command = [
+    return [
         'ffmpeg', '-y',
+        *hw_decode_args(encoder),
+        *_GENPTS_INPUT_ARGS,
         '-i', video_path,
         '-vf', f"subtitles='{safe_srt_path}':force_style='{style_string}'",
         '-c:a', 'copy',
-        '-c:v', 'libx264', '-preset', 'fast', '-crf', '23',
+        *video_encoder_args(encoder),
+        *_MP4_OUTPUT_ARGS,
         output_path
     ]
+
+
+def burn_subtitles(
+    video_path: str,
+    srt_path: str,
+    output_path: str,
+    alignment: str = "bottom",
+    fontsize: int = 16,
+    video_codec: Optional[str] = None
+) -> None:
+    """
+    Burn subtitles into video using FFmpeg.
+    
+    Args:
+        video_path: Source video path
+        srt_path: SRT subtitle file path
+        output_path: Destination video path
+        alignment: Subtitle alignment ('top', 'middle', 'bottom')
+        fontsize: Font size multiplier
+        video_codec: Encoder override, 'auto' for hardware detection (default: AppConfig.video_codec)
+        
+    Raises:
+        FFmpegError: If FFmpeg command fails
+    """
+    command = _build_burn_cmd(video_path, srt_path, output_path, alignment, fontsize, video_codec)
     
-    result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    returncode, stderr = run_ffmpeg(command)
     
-    if result.returncode != 0:
+    if returncode != 0:
         raise FFmpegError(
             f"Failed to burn subtitles into {video_path}",
             command=' '.join(command),
-            stderr=result.stderr.decode() if result.stderr else None
+            stderr=stderr or None
         )
 
 
+def _build_merge_cmd(video_path: str, audio_path: str, output_path: str) -> List[str]:
+    return [
+        'ffmpeg', '-y',
+        *_GENPTS_INPUT_ARGS,
+        '-i', video_path,
+        '-i', audio_path,
+        '-c:v', 'copy',
+        '-c:a', 'copy',
+        *_MP4_OUTPUT_ARGS,
+        output_path
+    ]
+
+
 def merge_audio_video(video_path: str, audio_path: str, output_path: str) -> None:
     """
     Merge video and audio streams.
@@ -226,39 +726,25 @@ def merge_audio_video(video_path: str, audio_path: str, output_path: str) -> Non
     Raises:
         FFmpegError: If FFmpeg command fails
     """
-    command = [
-        'ffmpeg', '-y',
-        '-i', video_path,
-        '-i', audio_path,
-        '-c:v', 'copy',
-        '-c:a', 'copy',
-        output_path
-    ]
+    command = _build_merge_cmd(video_path, audio_path, output_path)
     
-    result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    returncode, stderr = run_ffmpeg(command)
     
-    if result.returncode != 0:
+    if returncode != 0:
         raise FFmpegError(
             f"Failed to merge audio and video",
             command=' '.join(command),
-            stderr=result.stderr.decode() if result.stderr else None
+            stderr=stderr or None
         )
 
 
+@lru_cache(maxsize=1)
 def check_ffmpeg_available() -> bool:
     """
-    Check if FFmpeg is available in PATH.
+    Check if FFmpeg is available in PATH (a lookup only; nothing is executed).
+    The result is cached for the lifetime of the process.
     
     Returns:
         True if FFmpeg is available, False otherwise
     """
-    try:
-        subprocess.run(
-            ['ffmpeg', '-version'],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            check=True
-        )
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
+    return shutil.which('ffmpeg') is not None
@@ -0,0 +1,60 @@
+"""
+FFmpeg Job Runner
+Runs FFmpeg commands with quiet logging and a per-job thread cap.
+"""
+import os
+import subprocess
+import tempfile
+from typing import List, Tuple
+
+# How much of a failed command's stderr is kept for the error message
+STDERR_TAIL_BYTES = 64 * 1024
+
+
+# Set in clip worker processes to cap -threads for every encode they start
+JOB_THREADS_ENV = 'OPUS_FFMPEG_THREADS'
+
+
+def job_thread_count(default: int = 0) -> int:
+    """-threads for an encode: the per-job cap if this process has one, else default (0 = auto)"""
+    return int(os.environ.get(JOB_THREADS_ENV) or default)
+
+
+def run_ffmpeg(command: List[str]) -> Tuple[int, str]:
+    """
+    Run one ffmpeg command with quiet logging.
+    
+    '-loglevel error -nostats' is added unless the command sets a log level, and
+    stderr goes to a temporary file rather than a pipe, so long encodes don't
+    accumulate progress output in memory. Only the tail is read, and only on failure.
+    FFmpeg runs in its own session, so a Ctrl-C at the terminal doesn't kill it
+    mid-write; cancellation is left to the pipeline.
+    
+    Args:
+        command: FFmpeg command starting with 'ffmpeg'
+        
+    Returns:
+        (returncode, stderr tail); the stderr tail is '' on success
+    """
+    with tempfile.TemporaryFile() as stderr_file:
+        returncode = subprocess.run(
+            _quiet(command),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=stderr_file,
+            start_new_session=True
+        ).returncode
+        return returncode, _stderr_tail(stderr_file) if returncode != 0 else ''
+
+
+def _quiet(command: List[str]) -> List[str]:
+    if '-loglevel' in command or '-v' in command:
+        return command
+    return [command[0], '-hide_banner', '-loglevel', 'error', '-nostats', *command[1:]]
+
+
+def _stderr_tail(stderr_file) -> str:
+    size = stderr_file.seek(0, os.SEEK_END)
+    stderr_file.seek(max(0, size - STDERR_TAIL_BYTES))
+    return stderr_file.read().decode(errors='replace')
+
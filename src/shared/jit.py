@@ -0,0 +1,19 @@
+"""
+Optional JIT Compilation
+Exposes numba's njit when numba is installed, otherwise a no-op decorator,
+so hot numeric helpers run natively when possible and as plain Python otherwise.
+"""
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback for @njit / @njit(...) when numba is not installed"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
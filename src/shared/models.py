@@ -2,7 +2,7 @@
 Domain Models for Opus Video Service
 Centralized location for all business domain objects.
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, List, Dict
 from pathlib import Path
 
@@ -11,7 +11,7 @@ from pathlib import Path
 # Video-related Models
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VideoInfo:
     """Represents video file metadata"""
     path: Path
@@ -20,33 +20,28 @@ class VideoInfo:
     fps: float
     duration: float  # in seconds
     has_audio: bool = True
+    frame_count: int = 0
     
-    @property
-    def aspect_ratio(self) -> float:
-        """Calculate aspect ratio"""
-        return self.width / self.height
-    
-    @property
-    def is_vertical(self) -> bool:
-        """Check if video is vertical (9:16 or similar)"""
-        return self.height > self.width
+    # Derived once in __post_init__ (frozen, so they can't go stale)
+    aspect_ratio: float = field(init=False, repr=False, compare=False)
+    is_vertical: bool = field(init=False, repr=False, compare=False)  # 9:16 or similar
+    is_horizontal: bool = field(init=False, repr=False, compare=False)  # 16:9 or similar
     
-    @property
-    def is_horizontal(self) -> bool:
-        """Check if video is horizontal (16:9 or similar)"""
-        return self.width > self.height
+    def __post_init__(self):
+        object.__setattr__(self, 'aspect_ratio', self.width / self.height if self.height else 0.0)
+        object.__setattr__(self, 'is_vertical', self.height > self.width)
+        object.__setattr__(self, 'is_horizontal', self.width > self.height)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TimeRange:
     """Represents a time range in a video"""
     start: float  # seconds
     end: float    # seconds
+    duration: float = field(init=False, repr=False, compare=False)
     
-    @property
-    def duration(self) -> float:
-        """Calculate duration of the range"""
-        return self.end - self.start
+    def __post_init__(self):
+        object.__setattr__(self, 'duration', self.end - self.start)
     
     def contains(self, timestamp: float) -> bool:
         """Check if a timestamp falls within this range"""
@@ -57,62 +52,56 @@ class TimeRange:
         return not (self.end < other.start or self.start > other.end)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ViralClip:
     """Represents a detected viral clip segment"""
     time_range: TimeRange
     title: str
     descriptions: Dict[str, str]  # platform -> description mapping
     confidence: Optional[float] = None
+    start: float = field(init=False, repr=False, compare=False)
+    end: float = field(init=False, repr=False, compare=False)
+    duration: float = field(init=False, repr=False, compare=False)
     
-    @property
-    def start(self) -> float:
-        return self.time_range.start
-    
-    @property
-    def end(self) -> float:
-        return self.time_range.end
-    
-    @property
-    def duration(self) -> float:
-        return self.time_range.duration
+    def __post_init__(self):
+        object.__setattr__(self, 'start', self.time_range.start)
+        object.__setattr__(self, 'end', self.time_range.end)
+        object.__setattr__(self, 'duration', self.time_range.duration)
 
 
 # ============================================================================
 # Transcript-related Models
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Word:
     """Represents a single transcribed word"""
     text: str
     start: float
     end: float
     probability: float = 1.0
+    duration: float = field(init=False, repr=False, compare=False)
     
-    @property
-    def duration(self) -> float:
-        return self.end - self.start
+    def __post_init__(self):
+        object.__setattr__(self, 'duration', self.end - self.start)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TranscriptSegment:
     """Represents a segment of transcription"""
     text: str
     start: float
     end: float
     words: List[Word]
+    duration: float = field(init=False, repr=False, compare=False)
+    word_count: int = field(init=False, repr=False, compare=False)
     
-    @property
-    def duration(self) -> float:
-        return self.end - self.start
-    
-    @property
-    def word_count(self) -> int:
-        return len(self.words)
+    def __post_init__(self):
+        object.__setattr__(self, 'duration', self.end - self.start)
+        object.__setattr__(self, 'word_count', len(self.words))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Transcript:
     """Complete transcript with metadata"""
     text: str
@@ -189,7 +178,21 @@ class Transcript:
 # Subtitle Models
 # ============================================================================
 
-@dataclass
+def format_srt_time(seconds: float) -> str:
+    """Format seconds as an SRT timestamp (HH:MM:SS,mmm), rounded to the millisecond"""
+    ms = int(seconds * 1000 + 0.5)
+    h, ms = divmod(ms, 3_600_000)
+    m, ms = divmod(ms, 60_000)
+    s, ms = divmod(ms, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+
+def format_srt_block(index: int, start: float, end: float, text: str) -> str:
+    """Format one numbered SRT cue, including its trailing blank line"""
+    return f"{index}\n{format_srt_time(start)} --> {format_srt_time(end)}\n{text}\n\n"
+
+
+@dataclass(slots=True, frozen=True)
 class SubtitleBlock:
     """Represents a subtitle block for SRT generation"""
     index: int
@@ -199,50 +202,38 @@ class SubtitleBlock:
     
     def to_srt_format(self) -> str:
         """Convert to SRT format string"""
-        def format_time(seconds: float) -> str:
-            hours = int(seconds // 3600)
-            minutes = int((seconds % 3600) // 60)
-            secs = int(seconds % 60)
-            millis = int((seconds - int(seconds)) * 1000)
-            return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
-        
-        return f"{self.index}\n{format_time(self.start)} --> {format_time(self.end)}\n{self.text}\n\n"
+        return format_srt_block(self.index, self.start, self.end, self.text)
 
 
 # ============================================================================
 # Scene Analysis Models
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SceneInfo:
     """Represents a detected scene"""
     start_frame: int
     end_frame: int
     fps: float
     strategy: str = 'TRACK'  # 'TRACK' or 'GENERAL'
+    start_time: float = field(init=False, repr=False, compare=False)
+    end_time: float = field(init=False, repr=False, compare=False)
+    duration: float = field(init=False, repr=False, compare=False)
+    frame_count: int = field(init=False, repr=False, compare=False)
     
-    @property
-    def start_time(self) -> float:
-        return self.start_frame / self.fps
-    
-    @property
-    def end_time(self) -> float:
-        return self.end_frame / self.fps
-    
-    @property
-    def duration(self) -> float:
-        return (self.end_frame - self.start_frame) / self.fps
-    
-    @property
-    def frame_count(self) -> int:
-        return self.end_frame - self.start_frame
+    def __post_init__(self):
+        frame_count = self.end_frame - self.start_frame
+        object.__setattr__(self, 'frame_count', frame_count)
+        object.__setattr__(self, 'start_time', self.start_frame / self.fps if self.fps else 0.0)
+        object.__setattr__(self, 'end_time', self.end_frame / self.fps if self.fps else 0.0)
+        object.__setattr__(self, 'duration', frame_count / self.fps if self.fps else 0.0)
 
 
 # ============================================================================
 # Configuration Models
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingConfig:
     """Configuration for video processing pipeline"""
     # Transcription
@@ -256,7 +247,7 @@ class ProcessingConfig:
     output_fps: int = 30
     
     # Video encoding
-    video_codec: str = "libx264"
+    video_codec: str = "auto"  # auto (hardware if available), libx264, h264_nvenc, h264_qsv, h264_videotoolbox
     audio_codec: str = "aac"
     preset: str = "fast"
     crf: int = 23
@@ -0,0 +1,136 @@
+"""
+MP4 Container Probe
+Reads video metadata straight from the ISO-BMFF 'moov' box (MP4/MOV/M4V)
+without starting a decoder or a subprocess.
+"""
+import os
+import struct
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+MP4_EXTENSIONS = ('.mp4', '.mov', '.m4v')
+
+# Container boxes on the path to the sample tables; everything else is skipped
+_CONTAINER_BOXES = {b'trak', b'mdia', b'minf', b'stbl'}
+
+
+def _iter_boxes(f: BinaryIO, start: int, end: int) -> Iterator[Tuple[bytes, int, int]]:
+    """Yields (type, payload_offset, payload_end) for the boxes in [start, end)"""
+    offset = start
+    while offset + 8 <= end:
+        f.seek(offset)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack('>I4s', header)
+        payload = offset + 8
+        if size == 1:
+            size = struct.unpack('>Q', f.read(8))[0]
+            payload += 8
+        elif size == 0:
+            size = end - offset
+        if size < payload - offset:
+            return
+        yield box_type, payload, offset + size
+        offset += size
+
+
+def _read_boxes(f: BinaryIO, start: int, end: int, into: dict) -> None:
+    """Collect the payload ranges of one track's leaf boxes we care about"""
+    for box_type, payload, box_end in _iter_boxes(f, start, end):
+        if box_type in _CONTAINER_BOXES:
+            _read_boxes(f, payload, box_end, into)
+        elif box_type in (b'tkhd', b'hdlr', b'mdhd', b'stsd', b'stts', b'stsz') and box_type not in into:
+            # First one wins: QuickTime files carry a second (data) hdlr inside minf
+            f.seek(payload)
+            into[box_type] = f.read(min(box_end - payload, 4096))
+
+
+def _is_quarter_turn(tkhd: Optional[bytes]) -> bool:
+    """True if the track header's display matrix rotates by +-90 degrees (phone portrait video)"""
+    if not tkhd:
+        return False
+    # Matrix follows the times/ids (v0: 20 bytes, v1: 32) and 16 bytes of layer/volume fields
+    offset = 4 + (32 if tkhd[0] == 1 else 20) + 16
+    if len(tkhd) < offset + 16:
+        return False
+    a, b, _, c, d = struct.unpack_from('>5i', tkhd, offset)
+    return a == 0 and d == 0 and b != 0 and c != 0
+
+
+def _parse_video_track(boxes: dict) -> Optional[Tuple[int, int, float, int, float]]:
+    mdhd = boxes.get(b'mdhd')
+    stsd = boxes.get(b'stsd')
+    stts = boxes.get(b'stts')
+    if not mdhd or not stsd or not stts:
+        return None
+    
+    if mdhd[0] == 1:
+        timescale, media_duration = struct.unpack_from('>IQ', mdhd, 20)
+    else:
+        timescale, media_duration = struct.unpack_from('>II', mdhd, 12)
+    if not timescale:
+        return None
+    
+    # First visual sample entry: fullbox(4) count(4) size(4) type(4) then width/height at +32
+    width, height = struct.unpack_from('>HH', stsd, 8 + 32)
+    if _is_quarter_turn(boxes.get(b'tkhd')):
+        width, height = height, width  # Report the upright (display) geometry
+    
+    entry_count = struct.unpack_from('>I', stts, 4)[0]
+    stsz = boxes.get(b'stsz')
+    if stsz and len(stsz) >= 12:
+        frame_count = struct.unpack_from('>I', stsz, 8)[0]
+    else:
+        frame_count = sum(
+            struct.unpack_from('>I', stts, 8 + i * 8)[0]
+            for i in range(min(entry_count, (len(stts) - 8) // 8))
+        )
+    
+    # Constant frame rate: exact, e.g. 30000/1001. Stills and broken muxes can
+    # write a single zero delta, which falls through to the average.
+    delta = struct.unpack_from('>I', stts, 12)[0] if entry_count == 1 else 0
+    if delta:
+        fps = timescale / delta
+    else:
+        fps = frame_count * timescale / media_duration if media_duration else 0.0
+    
+    return width, height, fps, frame_count, media_duration / timescale
+
+
+def mp4_probe(video_path: str) -> Optional[tuple]:
+    """
+    Parse moov -> trak -> mdia boxes for the first video track.
+    
+    Args:
+        video_path: Path to an MP4/MOV/M4V file
+        
+    Returns:
+        (width, height, fps, frame_count, duration, has_audio), or None if the
+        file isn't a plain (non-fragmented) MP4 this parser understands
+    """
+    try:
+        with open(video_path, 'rb') as f:
+            file_size = os.fstat(f.fileno()).st_size
+            moov = next(((p, e) for t, p, e in _iter_boxes(f, 0, file_size) if t == b'moov'), None)
+            if moov is None:
+                return None
+            
+            video = None
+            has_audio = False
+            for box_type, payload, box_end in _iter_boxes(f, *moov):
+                if box_type != b'trak':
+                    continue
+                boxes = {}
+                _read_boxes(f, payload, box_end, boxes)
+                handler = boxes.get(b'hdlr', b'')[8:12]
+                if handler == b'soun':
+                    has_audio = True
+                elif handler == b'vide' and video is None:
+                    video = _parse_video_track(boxes)
+    except (OSError, struct.error):
+        return None
+    
+    # Fragmented MP4s keep their samples in moof boxes: empty tables here
+    if video is None or not all(video[:4]):
+        return None
+    return (*video, has_audio)
@@ -0,0 +1,74 @@
+"""
+Path Utilities
+Filesystem-safe naming and file helpers shared by the downloaders.
+"""
+import os
+from functools import lru_cache
+from typing import Optional
+
+# Characters that are invalid in filenames on Windows (and '/' everywhere) are
+# deleted and spaces become underscores, all in one C-level str.translate pass
+_FILENAME_TABLE = str.maketrans(' ', '_', '<>:"/\\|?*')
+
+
+@lru_cache(maxsize=1024)
+def sanitize_filename(filename: str) -> str:
+    """
+    Sanitize filename by removing invalid characters.
+    
+    Args:
+        filename: Original filename
+        
+    Returns:
+        Sanitized filename safe for filesystem
+    """
+    # Remove invalid characters, replace spaces with underscores, limit length
+    return filename.translate(_FILENAME_TABLE)[:100]
+
+
+def find_downloaded_file(output_dir: str, stem: str, extension: Optional[str] = '.mp4') -> Optional[str]:
+    """
+    Locate a downloaded file in one directory pass.
+    
+    Prefers the exact '<stem>.mp4', otherwise returns the first file whose name
+    starts with stem (and ends with extension, if given).
+    
+    Args:
+        output_dir: Directory the downloader wrote to
+        stem: Expected filename without extension
+        extension: Required extension for prefix matches, or None to accept any
+        
+    Returns:
+        Path to the file, or None if nothing matches
+    """
+    expected = f"{stem}.mp4"
+    candidate = None
+    try:
+        with os.scandir(output_dir) as entries:
+            for entry in entries:
+                if entry.name == expected:
+                    return entry.path
+                if (candidate is None and entry.name.startswith(stem)
+                        and (extension is None or entry.name.endswith(extension))
+                        and entry.is_file()):
+                    candidate = entry.path
+    except FileNotFoundError:
+        return None
+    return candidate
+
+
+def write_text_if_changed(path: str, text: str):
+    """
+    Write text to path unless the file already holds exactly that content.
+    Skips the rewrite (and any file watchers it would trigger) on repeat calls.
+    """
+    data = text.encode()
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, 'rb') as f:
+                if f.read() == data:
+                    return
+    except OSError:
+        pass  # Missing or unreadable: just write it
+    with open(path, 'wb') as f:
+        f.write(data)
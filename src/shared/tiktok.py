@@ -4,12 +4,14 @@ Handles video downloading from TikTok using yt-dlp.
 Extends functionality similar to youtube.py for consistent user experience.
 """
 import os
-import re
 import time
-import yt_dlp
-from pathlib import Path
 from typing import Tuple
 from .exceptions import TikTokDownloadError, InvalidURLError
+from .ydl import output_template, shared_youtube_dl
+from .paths import find_downloaded_file, sanitize_filename, write_text_if_changed
+
+# Minimum seconds between progress bar redraws while downloading
+PROGRESS_EVERY_SECONDS = 0.1
 
 
 class QuietLogger:
@@ -24,24 +26,6 @@ class QuietLogger:
         print(msg)
 
 
-def sanitize_filename(filename: str) -> str:
-    """
-    Sanitize filename by removing invalid characters.
-    
-    Args:
-        filename: Original filename
-        
-    Returns:
-        Sanitized filename safe for filesystem
-    """
-    # Remove invalid characters
-    filename = re.sub(r'[<>:"/\\|?*]', '', filename)
-    # Replace spaces with underscores
-    filename = filename.replace(' ', '_')
-    # Limit length
-    return filename[:100]
-
-
 def download_tiktok_video(url: str, output_dir: str = ".") -> Tuple[str, str]:
     """
     Download video from TikTok URL with Rich progress bar.
@@ -73,34 +57,13 @@ def download_tiktok_video(url: str, output_dir: str = ".") -> Tuple[str, str]:
     if cookies_env:
         print("🍪 Found COOKIES env var, using it.")
         try:
-            with open(cookies_path, 'w') as f:
-                f.write(cookies_env)
+            write_text_if_changed(cookies_path, cookies_env)
         except Exception as e:
             print(f"⚠️ Failed to write cookies file: {e}")
             cookies_path = None
     elif not os.path.exists(cookies_path):
         cookies_path = None
 
-    # Get video info first
-    ydl_opts_info = {
-        'quiet': True,
-        'no_warnings': True,
-        'extract_flat': True,
-        'cookiefile': cookies_path,
-        'logger': QuietLogger() 
-    }
-    
-    try:
-        with yt_dlp.YoutubeDL(ydl_opts_info) as ydl:
-            info = ydl.extract_info(url, download=False)
-            video_title = info.get('title', 'tiktok_video')
-            sanitized_title = sanitize_filename(video_title)
-    except Exception as e:
-        # Fallback if title extraction fails
-        sanitized_title = f"tiktok_{int(time.time())}"
-
-    output_template = os.path.join(output_dir, f'{sanitized_title}.%(ext)s')
-    
     # Rich Progress Context
     progress = Progress(
         SpinnerColumn(),
@@ -115,52 +78,80 @@ def download_tiktok_video(url: str, output_dir: str = ".") -> Tuple[str, str]:
         TimeRemainingColumn(),
     )
 
-    task_id = progress.add_task("Downloading...", filename=sanitized_title, start=False)
+    task_id = progress.add_task("Downloading...", filename="", start=False)
+
+    update = progress.update
+    last_update = 0.0
+    started = False
 
     def progress_hook_rich(d):
-        if d['status'] == 'downloading':
+        nonlocal last_update, started
+        status = d['status']
+        if status == 'downloading':
             total = d.get('total_bytes') or d.get('total_bytes_estimate')
+            if not total:
+                return
             downloaded = d.get('downloaded_bytes', 0)
             
-            if total:
+            # yt-dlp calls this per chunk; every update re-renders the bar, so throttle
+            now = time.monotonic()
+            if now - last_update < PROGRESS_EVERY_SECONDS and downloaded < total:
+                return
+            last_update = now
+            
+            if not started:
                 progress.start_task(task_id)
-                progress.update(task_id, total=total, completed=downloaded)
+                started = True
+            update(task_id, total=total, completed=downloaded)
                 
-        elif d['status'] == 'finished':
-            progress.update(task_id, completed=d.get('total_bytes'), description="Processing...")
+        elif status == 'finished':
+            update(task_id, completed=d.get('total_bytes'), description="Processing...")
 
-    # Download options
+    # One YoutubeDL for both the title lookup and the download, kept across
+    # calls: building it loads the whole extractor registry
     ydl_opts = {
+        'no_warnings': True,
         'format': 'best', # TikTok usually single file
-        'outtmpl': output_template,
         'quiet': True,
         'noprogress': True, 
         'overwrites': True,
         'cookiefile': cookies_path,
         'retries': 3,
-        'progress_hooks': [progress_hook_rich],
         'logger': QuietLogger(),
     }
     
     try:
         with progress:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
+            with shared_youtube_dl('tiktok', ydl_opts, cookies_path).session(progress_hook_rich) as ydl:
+                try:
+                    info = ydl.extract_info(url, download=False)
+                    sanitized_title = sanitize_filename(info.get('title', 'tiktok_video'))
+                except Exception:
+                    # If we can't get title, use timestamp
+                    info = None
+                    sanitized_title = f"tiktok_{int(time.time())}"
+                
+                update(task_id, filename=sanitized_title)
+                
+                downloaded_file = None
+                with output_template(ydl, os.path.join(output_dir, f'{sanitized_title}.%(ext)s')):
+                    if info is None:
+                        ydl.download([url])
+                    else:
+                        # yt-dlp reports the final (post-merge) path, so no directory scan is needed
+                        result = ydl.process_ie_result(info, download=True)
+                        requested = result.get('requested_downloads') or [{}]
+                        downloaded_file = requested[0].get('filepath')
     except Exception as e:
         raise TikTokDownloadError(f"Failed to download TikTok video: {str(e)}", url=url)
     
     # Determine final filename (might be mp4 or unpredictable)
     # TikTok downloads usually result in .mp4
-    downloaded_file = os.path.join(output_dir, f'{sanitized_title}.mp4')
-    
-    # Fallback search
-    if not os.path.exists(downloaded_file):
-        for f in os.listdir(output_dir):
-            if f.startswith(sanitized_title):
-                downloaded_file = os.path.join(output_dir, f)
-                break
+    # Fallback search accepts any extension
+    if not downloaded_file or not os.path.exists(downloaded_file):
+        downloaded_file = find_downloaded_file(output_dir, sanitized_title, extension=None)
     
-    if not os.path.exists(downloaded_file):
+    if downloaded_file is None:
         raise TikTokDownloadError(f"Download completed but file not found.", url=url)
                 
     return downloaded_file, sanitized_title
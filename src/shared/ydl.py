@@ -0,0 +1,110 @@
+"""
+Shared yt-dlp Instances
+Building a YoutubeDL loads the whole extractor registry, so each downloader
+keeps one instance alive and reuses it across URLs.
+"""
+import atexit
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+_instances: Dict[str, Tuple[tuple, "SharedYoutubeDL"]] = {}
+_instances_lock = threading.Lock()
+
+
+class SharedYoutubeDL:
+    """
+    A long-lived YoutubeDL plus the lock that serializes its use.
+    Progress hooks are bound per download through a stable dispatcher,
+    since yt-dlp only takes hooks at construction time.
+    """
+    
+    def __init__(self, params: dict):
+        import yt_dlp
+        
+        self.lock = threading.Lock()
+        self._params = params
+        self._progress_hook = None
+        self.ydl = yt_dlp.YoutubeDL({**params, 'progress_hooks': [self._dispatch_progress]})
+    
+    def _dispatch_progress(self, d):
+        if self._progress_hook is not None:
+            self._progress_hook(d)
+    
+    @contextmanager
+    def session(self, progress_hook=None) -> Iterator["yt_dlp.YoutubeDL"]:
+        """
+        Yield the shared YoutubeDL with progress_hook attached. If another thread
+        is using it, a throwaway instance is built instead of waiting.
+        """
+        if not self.lock.acquire(blocking=False):
+            import yt_dlp
+            
+            hooks = [progress_hook] if progress_hook is not None else []
+            with yt_dlp.YoutubeDL({**self._params, 'progress_hooks': hooks}) as ydl:
+                yield ydl
+            return
+        
+        self._progress_hook = progress_hook
+        try:
+            yield self.ydl
+        finally:
+            self._progress_hook = None
+            self.lock.release()
+    
+    def close(self):
+        self.ydl.close()
+
+
+@contextmanager
+def output_template(ydl, template: str) -> Iterator[None]:
+    """
+    Point ydl's downloads at template for the duration of the block, then
+    restore the previous template so it never leaks into a later download.
+    """
+    previous = ydl.params.get('outtmpl')
+    ydl.params['outtmpl'] = {'default': template}
+    try:
+        yield
+    finally:
+        ydl.params['outtmpl'] = previous
+
+
+def shared_youtube_dl(name: str, params: dict, cookies_path: Optional[str] = None) -> SharedYoutubeDL:
+    """
+    Get the shared instance for one downloader.
+    
+    Args:
+        name: Downloader name ('youtube', 'tiktok'); one instance is kept per name
+        params: YoutubeDL options (without progress_hooks), used when (re)building
+        cookies_path: Cookie file in params; changed contents rebuild the instance
+        
+    Returns:
+        SharedYoutubeDL to download through via session()
+    """
+    # Keyed on contents, not mtime: yt-dlp rewrites the file on close even
+    # when nothing changed
+    try:
+        with open(cookies_path, 'rb') as f:
+            version = (cookies_path, hashlib.sha1(f.read()).hexdigest())
+    except (OSError, TypeError):
+        version = (cookies_path, None)
+    
+    with _instances_lock:
+        entry = _instances.get(name)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        instance = SharedYoutubeDL(params)
+        _instances[name] = (version, instance)
+    
+    if entry is not None:
+        with entry[1].lock:  # Let a download still using it finish first
+            entry[1].close()
+    return instance
+
+
+@atexit.register
+def _close_instances():
+    for _, instance in _instances.values():
+        instance.close()
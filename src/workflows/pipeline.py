@@ -3,13 +3,29 @@ Main Pipeline Orchestrator
 High-level workflow for viral clips detection and processing.
 Consolidates logic from src/main.py run_pipeline function.
 """
-from pathlib import Path
-from typing import Optional
+import importlib
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import List, Optional, Tuple
+
+from rich.console import Console
+from rich.progress import Progress
 
 # New imports
-from src.shared.ffmpeg import get_video_info, get_video_resolution
-from src.features.cropping.service import process_viral_clip_with_smart_crop
+from src.shared.ffmpeg import check_ffmpeg_available, get_video_info
+from src.features.subtitles.renderer import SubtitleRenderer
 from src.shared.config import get_config
+from src.shared.exceptions import NoViralClipsFoundError
+from src.shared.ffmpeg_pool import JOB_THREADS_ENV
+
+console = Console()
+
+# Side work (SRT generation) that overlaps with the ffmpeg/OpenCV crop of a clip
+_executor = ThreadPoolExecutor(max_workers=4)
 
 
 class ViralClipsPipeline:
@@ -22,7 +38,6 @@ class ViralClipsPipeline:
         # Lazy load services to avoid circular imports
         self._transcription_service = None
         self._viral_clips_service = None
-        self._subtitle_renderer = None
     
     @property
     def transcription_service(self):
@@ -38,13 +53,6 @@ class ViralClipsPipeline:
             self._viral_clips_service = ViralClipsService()
         return self._viral_clips_service
     
-    @property
-    def subtitle_renderer(self):
-        if self._subtitle_renderer is None:
-            from src.features.subtitles.renderer import SubtitleRenderer
-            self._subtitle_renderer = SubtitleRenderer()
-        return self._subtitle_renderer
-    
     def run(
         self,
         input_path: str,
@@ -52,64 +60,159 @@ class ViralClipsPipeline:
         use_subs: bool = False,
         skip_analysis: bool = False,
         alignment: str = "bottom",
-        single_word: bool = False
+        single_word: bool = False,
+        cancel_event: Optional[threading.Event] = None,
+        ffmpeg_threads: Optional[int] = None
     ):
         """
         Execute the viral clips pipeline on a local video file.
+        If cancel_event gets set, the run stops at the next stage boundary:
+        no new clips are started, clips already being processed still finish.
+        ffmpeg_threads overrides the per-clip -threads budget used while clips
+        are processed concurrently (default: cores / clip_workers).
         """
-        from rich.console import Console
-        console = Console()
+        config = get_config()
         
         # Default output_dir from config if not provided
         if not output_dir or output_dir == "output":
-            output_dir = str(get_config().output_dir)
+            output_dir = str(config.output_dir)
         
         if not input_path:
             console.print("[bold red]❌ No input provided[/]")
             return
         
-        # Step 2: Transcribe
-        console.print(f"[bold cyan]🎙️  Transcribing audio...[/]")
-        transcript_dict = self.transcription_service.transcribe_to_dict(input_path, verbose=True)
-        console.print(f"[bold green]✅ Transcription complete[/]")
+        # Fail before the (long) transcription rather than at the first cut
+        if not check_ffmpeg_available():
+            console.print("[bold red]❌ FFmpeg not found in PATH[/]")
+            return
+        
+        # Probing and the Gemini client import are I/O-bound, so they run
+        # behind transcription instead of after it
+        probe_future = _executor.submit(get_video_info, input_path)
+        if not skip_analysis:
+            _executor.submit(importlib.import_module, 'src.features.viral_clips.service')
+        
+        # Step 2: Transcribe (windowed analysis transcribes while it analyzes instead)
+        windowed = not skip_analysis and config.analysis_window_seconds > 0
+        transcript_dict = None
+        if not windowed:
+            console.print(f"[bold cyan]🎙️  Transcribing audio...[/]")
+            transcript_dict = self.transcription_service.transcribe_to_dict(input_path, verbose=True)
+            console.print(f"[bold green]✅ Transcription complete[/]")
+        
+        if cancel_event is not None and cancel_event.is_set():
+            console.print("[yellow]⚠️ Pipeline cancelled[/]")
+            return
+        
+        # Metadata is read once and shared by both branches below
+        video_info = probe_future.result()
         
         # Step 3: Analyze or process whole video
+        windows = None
         if not skip_analysis:
             console.print(f"[bold cyan]🧠 Analyzing with Gemini AI...[/]")
-            from src.shared.ffmpeg import get_video_info
-            video_info = get_video_info(input_path)
             
-            try:
-                clips = self.viral_clips_service.find_viral_clips(
-                    transcript_dict,
-                    video_info.duration
-                )
-                console.print(f"[bold green]✅ Found {len(clips)} viral moments[/]")
+            submitted = 0
+            # Clips are independent, so each one is cropped in its own process;
+            # each worker's encodes get an equal share of the cores. Subtitle burns
+            # are handed to threads here (they just wait on ffmpeg), freeing the
+            # worker to crop the next clip while the previous one is burned.
+            threads = ffmpeg_threads or config.ffmpeg_threads_per_clip
+            # Spawned, not forked: this process already runs threads (the side-work
+            # executor, windowed Whisper) whose locks a fork could copy mid-use
+            with ProcessPoolExecutor(
+                max_workers=config.clip_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_clip_worker,
+                initargs=(threads,)
+            ) as executor, \
+                    ThreadPoolExecutor(max_workers=config.clip_workers) as burn_executor, \
+                    Progress(console=console) as progress:
+                task = progress.add_task("Processing clips", total=None)
+                futures = {}
+                
+                try:
+                    # Clips are streamed: cropping starts as soon as the first one is parsed
+                    if windowed:
+                        windows = _WindowedTranscription(
+                            self.transcription_service,
+                            input_path,
+                            config.analysis_window_seconds
+                        )
+                        clips = self._stream_windowed_clips(windows, video_info.duration)
+                    else:
+                        clips = (
+                            (clip, transcript_dict)
+                            for clip in self.viral_clips_service.stream_viral_clips(
+                                transcript_dict,
+                                video_info.duration
+                            )
+                        )
+                    for i, (clip, clip_transcript) in enumerate(clips, 1):
+                        if cancel_event is not None and cancel_event.is_set():
+                            progress.console.print("[yellow]⚠️ Cancelled: no more clips will be started[/]")
+                            break
+                        job = (
+                            input_path,
+                            clip.start,
+                            clip.end,
+                            clip_transcript,
+                            output_dir,
+                            use_subs,
+                            alignment,
+                            f"clip_{i}",
+                            single_word
+                        )
+                        futures[executor.submit(_crop_clip_job, job)] = i
+                        submitted = i
+                        progress.update(task, total=submitted)
+                except Exception as e:
+                    progress.console.print(f"[bold red]❌ AI Analysis failed: {e}[/]")
+                    if not submitted:
+                        progress.console.print("[yellow]Processing entire video instead...[/]")
+                        skip_analysis = True
+                
+                def report(i, logs):
+                    progress.console.print(f"\n[bold magenta]Clip {i}/{submitted}[/]")
+                    for line in logs:
+                        progress.console.print(line)
+                    progress.advance(task)
                 
-                # Process each clip
-                for i, clip in enumerate(clips, 1):
-                    console.print(f"\n[bold magenta]Processing Clip {i}/{len(clips)}...[/]")
-                    self._process_single_clip(
-                        input_path,
-                        clip.start,
-                        clip.end,
-                        transcript_dict,
-                        output_dir,
-                        use_subs,
-                        alignment,
-                        f"clip_{i}",
-                        single_word
-                    )
-            except Exception as e:
-                console.print(f"[bold red]❌ AI Analysis failed: {e}[/]")
-                console.print("[yellow]Processing entire video instead...[/]")
-                skip_analysis = True
+                # Single writer: only the parent process touches the console
+                burn_futures = {}
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        logs, burn = future.result()
+                    except (Exception, KeyboardInterrupt) as e:
+                        progress.console.print(f"[bold red]❌ Clip {i} failed: {e}[/]")
+                        progress.advance(task)
+                        continue
+                    if burn is None:
+                        report(i, logs)
+                    else:
+                        burn_futures[burn_executor.submit(_burn_clip, burn, threads)] = (i, logs)
+                
+                for future in as_completed(burn_futures):
+                    i, logs = burn_futures[future]
+                    try:
+                        report(i, logs + future.result())
+                    except (Exception, KeyboardInterrupt) as e:
+                        progress.console.print(f"[bold red]❌ Clip {i} failed: {e}[/]")
+                        progress.advance(task)
+            
+            if submitted:
+                console.print(f"[bold green]✅ Processed {submitted} viral moments[/]")
         
-        if skip_analysis:
+        if skip_analysis and not (cancel_event is not None and cancel_event.is_set()):
             # Process entire video
             console.print(f"[bold cyan]📹 Processing entire video...[/]")
-            from src.shared.ffmpeg import get_video_info
-            video_info = get_video_info(input_path)
+            if windows is not None:
+                # Whisper is already partway through the video; let it finish
+                # rather than starting over alongside it
+                transcript_dict = windows.full_transcript()
+            if transcript_dict is None:
+                transcript_dict = self.transcription_service.transcribe_to_dict(input_path, verbose=True)
             
             self._process_single_clip(
                 input_path,
@@ -122,9 +225,31 @@ class ViralClipsPipeline:
                 "full_video",
                 single_word
             )
+        elif windows is not None:
+            windows.stop()  # Cancelled or done: no one will read further windows
         
         console.print(f"\n[bold green]✨ Pipeline complete![/]")
     
+    def _stream_windowed_clips(self, windows: "_WindowedTranscription", duration: float):
+        """
+        Yield (clip, window transcript) pairs: each transcript window goes to
+        Gemini as soon as Whisper finishes it, while the next window is still
+        being transcribed in a background thread.
+        """
+        found = 0
+        while (window := windows.queue.get()) is not None:
+            if isinstance(window, Exception):
+                raise window
+            try:
+                for clip in self.viral_clips_service.stream_viral_clips(window, duration):
+                    found += 1
+                    yield clip, window
+            except NoViralClipsFoundError:
+                continue  # A quiet stretch; later windows can still have clips
+        
+        if not found:
+            raise NoViralClipsFoundError("Gemini did not find any viral clips")
+    
     def _process_single_clip(
         self,
         input_path: str,
@@ -138,58 +263,172 @@ class ViralClipsPipeline:
         single_word: bool = False
     ):
         """Process a single clip: crop and optionally add subtitles"""
-        from rich.console import Console
-        import os
-        
-        console = Console()
+        logs = _process_clip_job((
+            input_path, start, end, transcript_dict, output_dir,
+            use_subs, alignment, clip_name, single_word
+        ))
+        for line in logs:
+            console.print(line)
+
+
+class _WindowedTranscription:
+    """
+    Whisper running in a background thread, handing over transcript windows
+    as they finish. Every window is kept, so the full transcript is available
+    afterwards without transcribing the video a second time.
+    """
+    
+    def __init__(self, service, input_path: str, window_seconds: float):
+        self.queue = queue.Queue()
+        self._windows = []
+        self._failed = False
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(service, input_path, window_seconds),
+            daemon=True
+        )
+        self._thread.start()
+    
+    def _run(self, service, input_path: str, window_seconds: float):
+        try:
+            for window in service.iter_transcript_windows(input_path, window_seconds, verbose=True):
+                if self._stopped.is_set():
+                    break
+                self._windows.append(window)
+                self.queue.put(window)
+            self.queue.put(None)
+        except Exception as e:
+            self._failed = True
+            self.queue.put(e)
+    
+    def stop(self):
+        """Stop transcribing after the current window"""
+        self._stopped.set()
+    
+    def full_transcript(self) -> Optional[dict]:
+        """
+        Wait for the rest of the video and return the whole transcript,
+        or None if transcription failed.
+        """
+        self._thread.join()
+        if self._failed or self._stopped.is_set():
+            return None
+        segments = [seg for window in self._windows for seg in window['segments']]
+        return {
+            'text': "".join(f"{seg['text']} " for seg in segments).strip(),
+            'segments': segments,
+            'language': self._windows[0]['language'] if self._windows else None
+        }
+
+
+def _init_clip_worker(ffmpeg_threads: int):
+    """
+    Cap -threads for every ffmpeg encode started by this worker process, and
+    ignore Ctrl-C: the parent handles it by starting no new clips, and the
+    clips already running are left to finish.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    os.environ[JOB_THREADS_ENV] = str(ffmpeg_threads)
+
+
+def _process_clip_job(args: tuple) -> List[str]:
+    """Crop one clip to vertical and optionally burn subtitles, in this process"""
+    logs, burn = _crop_clip_job(args)
+    if burn is not None:
+        logs += _burn_clip(burn)
+    return logs
+
+
+def _crop_clip_job(args: tuple) -> Tuple[List[str], Optional[tuple]]:
+    """
+    Crop one clip to vertical and write its SRT if subtitles are on.
+    Module-level so it can run in a worker process; returns log lines
+    for the parent to print instead of writing to the console itself,
+    plus the _burn_clip arguments when subtitles still have to be burned.
+    """
+    (
+        input_path, start, end, transcript_dict, output_dir,
+        use_subs, alignment, clip_name, single_word
+    ) = args
+    logs = []
+    
+    # Output paths
+    cropped_path = os.path.join(output_dir, f"{clip_name}_vertical.mp4")
+    
+    # SRT generation only needs the transcript, so start it before the crop
+    srt_future = None
+    if use_subs:
+        renderer = SubtitleRenderer()
         
-        # Output paths
-        cropped_path = os.path.join(output_dir, f"{clip_name}_vertical.mp4")
+        final_path = os.path.join(output_dir, f"{clip_name}_subbed.mp4")
+        srt_path = os.path.join(output_dir, f"{clip_name}.srt")
         
-        # Crop to vertical
-        console.print(f"  ✂️  Cropping to vertical format...")
-        process_viral_clip_with_smart_crop(
-            input_path,
+        srt_future = _executor.submit(
+            renderer.generate_srt_from_transcript,
+            transcript_dict,
             start,
             end,
-            cropped_path
+            srt_path,
+            single_word=single_word
         )
-        
-        # Add subtitles if requested
-        if use_subs:
-            console.print(f"  📝 Adding subtitles...")
-            final_path = os.path.join(output_dir, f"{clip_name}_subbed.mp4")
-            srt_path = os.path.join(output_dir, f"{clip_name}.srt")
-            
-            self.subtitle_renderer.generate_srt_from_transcript(
-                transcript_dict,
-                start,
-                end,
-                srt_path,
-                single_word=single_word
-            )
-            
-            self.subtitle_renderer.burn_subtitles_to_video(
-                cropped_path,
-                srt_path,
-                final_path,
-                alignment
-            )
-            
-            console.print(f"  [bold green]✅ Saved: {final_path}[/]")
-        else:
-            console.print(f"  [bold green]✅ Saved: {cropped_path}[/]")
+    
+    # Crop to vertical (lazy: pulls in OpenCV DNN + YOLO/torch)
+    from src.features.cropping.service import process_viral_clip_with_smart_crop
+    
+    logs.append(f"  ✂️  Cropping to vertical format...")
+    process_viral_clip_with_smart_crop(
+        input_path,
+        start,
+        end,
+        cropped_path
+    )
+    
+    # Subtitles are burned by the caller; only paths cross the process boundary
+    if srt_future is not None:
+        srt_future.result()
+        return logs, (cropped_path, srt_path, final_path, alignment)
+    
+    logs.append(f"  [bold green]✅ Saved: {cropped_path}[/]")
+    return logs, None
+
+
+def _burn_clip(burn: tuple, threads: Optional[int] = None) -> List[str]:
+    """Burn a cropped clip's SRT into its final MP4; returns log lines"""
+    cropped_path, srt_path, final_path, alignment = burn
+    SubtitleRenderer().burn_subtitles_to_video(
+        cropped_path,
+        srt_path,
+        final_path,
+        alignment,
+        threads=threads
+    )
+    return [f"  📝 Adding subtitles...", f"  [bold green]✅ Saved: {final_path}[/]"]
 
 
 # Legacy function for backward compatibility
 def run_pipeline(
-    input_path: str,
+    input_path: Optional[str] = None,
     output_dir: str = "output",
     use_subs: bool = False,
     skip_analysis: bool = False,
     alignment: str = "bottom",
-    single_word: bool = False
+    single_word: bool = False,
+    url: Optional[str] = None,
+    cancel_event: Optional[threading.Event] = None,
+    ffmpeg_threads: Optional[int] = None
 ):
-    """Legacy function maintaining updated signature"""
+    """
+    Legacy function maintaining updated signature.
+    If only a YouTube url is given it is downloaded to the input folder first:
+    transcription needs a seekable file, so the source can't be streamed here.
+    """
+    if not input_path and url:
+        from src.shared.youtube import download_youtube_video
+        input_path, _ = download_youtube_video(url, str(get_config().input_dir))
+    
     pipeline = ViralClipsPipeline()
-    pipeline.run(input_path, output_dir, use_subs, skip_analysis, alignment, single_word)
+    pipeline.run(
+        input_path, output_dir, use_subs, skip_analysis, alignment, single_word,
+        cancel_event, ffmpeg_threads
+    )
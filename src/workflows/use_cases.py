@@ -2,9 +2,15 @@
 Individual Use Cases
 Standalone workflows for specific operations.
 """
-from pathlib import Path
+import os
 from typing import Optional
 
+from rich.console import Console
+
+from src.shared.config import get_config
+
+console = Console()
+
 
 def run_subtitles_only(
     input_path: str,
@@ -25,10 +31,6 @@ def run_subtitles_only(
     """
     from src.features.transcription.service import TranscriptionService
     from src.features.subtitles.service import SubtitlesService
-    from rich.console import Console
-    import os
-    
-    console = Console()
     
     # Transcribe
     console.print("[bold cyan]🎙️  Transcribing...[/]")
@@ -38,7 +40,6 @@ def run_subtitles_only(
     # Determine output path
     # If output_dir is "output" (legacy default) or None, use config
     if output_dir == "output":
-        from src.shared.config import get_config
         output_dir = str(get_config().output_dir)
         
     if specific_output_path:
@@ -77,9 +78,7 @@ def convert_to_vertical_split(
         effect_type: Optional entry effect
     """
     from src.features.editing.split_screen import make_vertical_split_video
-    from rich.console import Console
     
-    console = Console()
     console.print("[bold cyan]🎬 Creating split-screen...[/]")
     
     make_vertical_split_video(
@@ -108,9 +107,7 @@ def convert_to_vertical_blur(
         effect_type: Optional entry effect
     """
     from src.features.editing.blur_background import make_blur_background_vertical_video
-    from rich.console import Console
     
-    console = Console()
     console.print("[bold cyan]🎬 Creating blur background...[/]")
     
     make_blur_background_vertical_video(
@@ -139,9 +136,7 @@ def add_background_music_to_video(
         volume: Music volume (0.0-1.0)
     """
     from src.features.audio.service import AudioService
-    from rich.console import Console
     
-    console = Console()
     console.print("[bold cyan]🎵 Adding background music...[/]")
     
     audio = AudioService()
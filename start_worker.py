@@ -1,38 +1,146 @@
+import hashlib
 import os
+import shutil
 import sys
-import time
+import sysconfig
 import subprocess
+import tarfile
 import importlib
+import importlib.machinery
+import importlib.util
 
 # ---------------------------------------------------------
 # Auto-Venv Bootstrap
 # ---------------------------------------------------------
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+VENV_DIR = os.path.join(BASE_DIR, ".venv")
+# Next to this script, like the venv, so launching from another cwd still finds it
+REQUIREMENTS = os.path.join(BASE_DIR, "requirements.txt")
+
+# Packed site-packages of a finished install, shared by every clone on this machine
+VENV_SNAPSHOT_DIR = os.environ.get("OPUS_VENV_SNAPSHOT_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "opus-video-service"
+)
+
+
+def _requirements_hash():
+    try:
+        with open(REQUIREMENTS, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return ""
+
+
+def _pip_install_args(prefer_binary=True):
+    """
+    'install' arguments for requirements.txt: prefer wheels over building sdists
+    (opencv/torch source builds take ages) and use a local wheelhouse if configured.
+    --only-binary isn't used: moviepy 1.0.3 ships as an sdist only.
+    """
+    args = ["install", "-r", REQUIREMENTS]
+    if prefer_binary:
+        args.append("--prefer-binary")
+    if os.environ.get("OPUS_CONTAINER_BUILD"):
+        # Image layers shouldn't carry pip's wheel cache
+        args.append("--no-cache-dir")
+    wheelhouse = os.environ.get("OPUS_WHEELHOUSE")
+    if wheelhouse and os.path.isdir(wheelhouse):
+        args += ["--find-links", wheelhouse]
+    return args
+
+
+def _venv_site_packages(venv_dir):
+    if os.name == 'nt':
+        return os.path.join(venv_dir, "Lib", "site-packages")
+    return os.path.join(venv_dir, "lib", f"python{sys.version_info[0]}.{sys.version_info[1]}", "site-packages")
+
+
+def _venv_snapshot_path():
+    """One snapshot per requirements.txt content, interpreter version and platform"""
+    key = f"{_requirements_hash()[:16]}-py{sys.version_info[0]}{sys.version_info[1]}-{sys.platform}"
+    return os.path.join(VENV_SNAPSHOT_DIR, f"venv-{key}.tar.gz")
+
+
+def _restore_venv_snapshot(venv_dir):
+    """Unpack a matching site-packages snapshot into the new venv; False if there is none"""
+    snapshot = _venv_snapshot_path()
+    if not os.path.exists(snapshot):
+        return False
+    site_packages = _venv_site_packages(venv_dir)
+    try:
+        with tarfile.open(snapshot, "r:gz") as tar:
+            if hasattr(tarfile, "data_filter"):
+                tar.extractall(site_packages, filter="data")
+            else:
+                tar.extractall(site_packages)
+        return True
+    except (OSError, tarfile.TarError) as e:
+        print(f"⚠️ No se pudo restaurar la caché de dependencias ({e}); usando pip.")
+        return False
+
+
+def _save_venv_snapshot(venv_dir):
+    """
+    Pack site-packages after a successful install (fast gzip level) so the next
+    fresh clone can skip pip. Older snapshots are replaced.
+    """
+    snapshot = _venv_snapshot_path()
+    tmp_path = f"{snapshot}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(VENV_SNAPSHOT_DIR, exist_ok=True)
+        with tarfile.open(tmp_path, "w:gz", compresslevel=1) as tar:
+            tar.add(_venv_site_packages(venv_dir), arcname=".")
+        os.replace(tmp_path, snapshot)
+        for name in os.listdir(VENV_SNAPSHOT_DIR):
+            path = os.path.join(VENV_SNAPSHOT_DIR, name)
+            if name.startswith("venv-") and path != snapshot:
+                os.remove(path)
+    except OSError:
+        pass  # The snapshot is only an optimization
+
+
+# Set OPUS_SKIP_BOOTSTRAP=1 where the environment is prepared externally (Docker, CI):
+# no .venv, no re-exec and no dependency check
+SKIP_BOOTSTRAP = os.environ.get("OPUS_SKIP_BOOTSTRAP") == "1"
+# -y/--yes: install missing dependencies without the confirmation prompt
+AUTO_YES = "-y" in sys.argv or "--yes" in sys.argv
+
+
 def ensure_venv():
     """Ensures the script runs inside a virtual environment (.venv)."""
-    venv_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".venv")
+    venv_dir = VENV_DIR
     
-    # Are we already in a virtual environment?
+    # Are we already in a virtual environment (or in a container/CI image that manages its own)?
     in_venv = sys.prefix != sys.base_prefix
     
-    if in_venv:
+    if in_venv or SKIP_BOOTSTRAP:
         return
 
     # If not in venv, check if .venv exists
     if not os.path.exists(venv_dir):
         print("\n🚀 Primera ejecución detectada. Configurando entorno virtual...")
         try:
-            subprocess.check_call([sys.executable, "-m", "venv", ".venv"])
+            subprocess.check_call([sys.executable, "-m", "venv", venv_dir])
             print("✅ Entorno virtual (.venv) creado.")
             
             # Identify venv python
             venv_python = os.path.join(venv_dir, "Scripts", "python.exe") if os.name == 'nt' else os.path.join(venv_dir, "bin", "python")
             
-            # Install requirements
-            if os.path.exists("requirements.txt"):
-                print("⏳ Instalando dependencias desde requirements.txt...")
-                subprocess.check_call([venv_python, "-m", "pip", "install", "--upgrade", "pip"])
-                subprocess.check_call([venv_python, "-m", "pip", "install", "-r", "requirements.txt"])
-                print("✅ Dependencias instaladas correctamente.")
+            # Install requirements (from the packed snapshot of a previous install if there is one)
+            if os.path.exists(REQUIREMENTS):
+                if _restore_venv_snapshot(venv_dir):
+                    print("✅ Dependencias restauradas desde la caché local.")
+                else:
+                    print("⏳ Instalando dependencias desde requirements.txt...")
+                    uv = shutil.which("uv")
+                    if uv:
+                        # uv resolves and downloads in parallel (and picks wheels on its own)
+                        subprocess.check_call([uv, "pip", *_pip_install_args(prefer_binary=False), "--python", venv_python])
+                    else:
+                        subprocess.check_call([venv_python, "-m", "pip", "install", "--upgrade", "pip"])
+                        subprocess.check_call([venv_python, "-m", "pip", *_pip_install_args()])
+                    _save_venv_snapshot(venv_dir)
+                    print("✅ Dependencias instaladas correctamente.")
         except Exception as e:
             print(f"❌ Error al configurar el entorno: {e}")
             sys.exit(1)
@@ -44,35 +152,110 @@ def ensure_venv():
         # Reiniciar usando el python del venv
         # print(f"🔄 Reiniciando en entorno virtual...")
         try:
-            # sys.argv[0] is the script path
-            result = subprocess.run([venv_python] + sys.argv)
-            sys.exit(result.returncode)
+            # sys.argv[0] is the script path (made absolute so the venv interpreter finds it from any cwd)
+            argv = [venv_python, os.path.abspath(sys.argv[0])] + sys.argv[1:]
+            if os.name == 'nt':
+                # execv on Windows spawns a detached child and breaks Ctrl+C
+                result = subprocess.run(argv)
+                sys.exit(result.returncode)
+            # Replace this process in place: no idle parent left holding memory
+            sys.stdout.flush()
+            os.execv(venv_python, argv)
         except Exception as e:
             print(f"❌ Error al reiniciar en el entorno virtual: {e}")
             sys.exit(1)
     else:
         print("⚠️ Advertencia: No se encontró el ejecutable en .venv. Continuando con el Python actual.")
 
-# Bootstrap before anything else
-ensure_venv()
-
 # ---------------------------------------------------------
 # Dependency Check (Pre-Rich)
 # ---------------------------------------------------------
+def _pip_install_requirements():
+    """
+    Install requirements.txt into the running interpreter. pip runs in-process
+    when possible (no second interpreter start + pip import); its internal API
+    isn't guaranteed, so a subprocess is the fallback.
+    """
+    args = _pip_install_args()
+    try:
+        from pip._internal.cli.main import main as pip_main
+    except ImportError:
+        subprocess.check_call([sys.executable, "-m", "pip", *args])
+        return
+    if pip_main(args) != 0:
+        raise RuntimeError("pip install falló")
+
+
+# Written after a successful library check; while the fingerprint matches,
+# later starts skip the check entirely
+DEPS_STAMP = os.path.join(sys.prefix, ".deps_ok")
+
+
+def _deps_fingerprint():
+    """
+    requirements.txt hash + interpreter version/platform + site-packages mtime
+    (which changes whenever a package is installed or removed).
+    """
+    try:
+        site_mtime = os.stat(sysconfig.get_paths()["purelib"]).st_mtime_ns
+    except OSError:
+        site_mtime = 0
+    return f"{_requirements_hash()}|{sys.version}|{sys.platform}|{site_mtime}"
+
+
+def _deps_stamp_matches():
+    try:
+        with open(DEPS_STAMP, "r", encoding="utf-8") as f:
+            return f.read() == _deps_fingerprint()
+    except OSError:
+        return False
+
+
+def _write_deps_stamp():
+    try:
+        with open(DEPS_STAMP, "w", encoding="utf-8") as f:
+            f.write(_deps_fingerprint())
+    except OSError:
+        pass  # Read-only prefix (system Python): just check every time
+
+
+def _module_exists(module_name):
+    """
+    True if module_name can be imported, without importing it. Dotted names are
+    resolved level by level through the parent's search path, since
+    importlib.util.find_spec would import the parent package to find the child.
+    """
+    top, *children = module_name.split('.')
+    spec = importlib.util.find_spec(top)
+    for child in children:
+        if spec is None or spec.submodule_search_locations is None:
+            return False
+        spec = importlib.machinery.PathFinder.find_spec(
+            f"{spec.name}.{child}", spec.submodule_search_locations
+        )
+    return spec is not None
+
+
 def check_dependencies():
     """Checks if FFMPEG and critical python libs are available."""
+    if SKIP_BOOTSTRAP:
+        return
+    
     print("🔍 Diagnosticando entorno...")
     missing = []
     
-    # Check FFMPEG
-    try:
-        subprocess.run(['ffmpeg', '-version'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    except FileNotFoundError:
-        # ... (keep ffmpeg error) ...
+    # Check FFMPEG (a PATH lookup only; no need to exec the binary)
+    ffmpeg_path = shutil.which('ffmpeg')
+    if ffmpeg_path is None:
         print("\n❌ ERROR: FFMPEG no está instalado o no está en el PATH.")
-        # ...
         sys.exit(1)
+    # moviepy/imageio use this binary directly instead of searching for one again
+    os.environ.setdefault('IMAGEIO_FFMPEG_EXE', ffmpeg_path)
         
+    # Environment unchanged since the last successful check
+    if _deps_stamp_matches():
+        return
+    
     # Check Python Libs (including rich)
     libs = [
         ('cv2', 'opencv-python'),
@@ -84,39 +267,55 @@ def check_dependencies():
         ('rich.console', 'rich')  # Check specific submodule for rich
     ]
     
+    # Only the import system's finders are consulted; nothing is executed,
+    # so torch/CUDA/grpc aren't loaded just to check they exist
+    missing_modules = []
     for module_name, pip_name in libs:
-        try:
-            importlib.import_module(module_name)
-        except ImportError:
+        if not _module_exists(module_name):
              missing.append(f"{pip_name}")
+             missing_modules.append(module_name)
 
     if missing:
         print("\n📦 Paquetes faltantes encontrados:")
         for m in missing:
             print(f"   - {m}")
         
-        confirm = input("\n¿Instalar paquetes faltantes ahora? (s/n) [s]: ").strip().lower() or 's'
+        if AUTO_YES or not sys.stdin.isatty():
+            # --yes, or nobody to answer the prompt (CI, Docker build): install without asking
+            confirm = 's'
+        else:
+            confirm = input("\n¿Instalar paquetes faltantes ahora? (s/n) [s]: ").strip().lower() or 's'
         
         if confirm == 's':
             try:
                 print("⏳ Instalando dependencias...")
-                subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
-                print("\n✅ Dependencias instaladas! Continuando...")
-                time.sleep(1)
+                _pip_install_requirements()
+                # One invalidation for the whole install, then re-resolve the missing
+                # modules: confirms pip delivered them and refills the finders' directory
+                # caches, so the real imports that follow don't rescan site-packages
                 importlib.invalidate_caches()
+                still_missing = [m for m in missing_modules if not _module_exists(m)]
+                if still_missing:
+                    raise RuntimeError(f"siguen sin encontrarse: {', '.join(still_missing)}")
+                print("\n✅ Dependencias instaladas! Continuando...")
             except Exception as e:
                 print(f"❌ Falló la instalación: {e}")
                 sys.exit(1)
         else:
             sys.exit(1)
-
-# Run check BEFORE importing rich
-check_dependencies()
+    
+    _write_deps_stamp()
 
 # ---------------------------------------------------------
 # Delegate to CLI
 # ---------------------------------------------------------
+# Only when run as the entry script: spawned clip workers re-import this
+# module as __mp_main__ and must not re-run the bootstrap or the pip check
 if __name__ == "__main__":
+    # Bootstrap before anything else, and check BEFORE importing rich
+    ensure_venv()
+    check_dependencies()
+    
     try:
         from src.main import main
         main()